@@ -0,0 +1,47 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from drf_nested.utils import stats_registry
+
+
+class Command(BaseCommand):
+    help = (
+        "Prints the cumulative nested save stats as JSON or in the Prometheus text format. "
+        "The registry is kept in memory, so the command prints the stats of its own process: "
+        "call it with `call_command` from the running application or pass the exported stats "
+        "with --input."
+    )
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=("json", "prometheus"), default="json")
+        parser.add_argument(
+            "--input",
+            action="append",
+            dest="inputs",
+            help="Path of the JSON file with the stats exported by `stats_registry.to_json()`",
+        )
+        parser.add_argument("--output", help="Path of the file to save the stats to")
+        parser.add_argument(
+            "--reset", action="store_true", help="Reset the registry after printing the stats"
+        )
+
+    def handle(self, *args, **options):
+        for path in options["inputs"] or []:
+            with open(path) as file:
+                stats_registry.load(json.load(file))
+
+        if options["format"] == "prometheus":
+            output = stats_registry.to_prometheus()
+        else:
+            output = stats_registry.to_json(indent=2) + "\n"
+
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                file.write(output)
+        else:
+            self.stdout.write(output, ending="")
+
+        if options["reset"]:
+            stats_registry.reset()
@@ -1,8 +1,18 @@
 from django.db import models
 from rest_framework import serializers
 
+from drf_nested.serializers import NestedListSerializerMixin
+from drf_nested.utils import NestedInstanceCache
+
+
+class BaseNestableMixin(NestedListSerializerMixin, serializers.ModelSerializer):
+    @property
+    def _instance_cache(self) -> NestedInstanceCache:
+        """
+        Existing instances of the nested tree, shared by all its serializers
+        """
+        return NestedInstanceCache.for_serializer(self)
 
-class BaseNestableMixin(serializers.ModelSerializer):
     def _get_model_pk(self):
         if isinstance(self, serializers.ListSerializer):
             model = self.child.Meta.model  # ty: ignore[unresolved-attribute]
@@ -14,6 +24,9 @@ class BaseNestableMixin(serializers.ModelSerializer):
         pk = self._get_model_pk()
         self.instance = None
         if validated_data and isinstance(validated_data, dict) and pk in validated_data:
+            if NestedInstanceCache.is_cacheable(queryset):
+                self.instance = self._instance_cache.get(queryset.model, validated_data.get(pk))
+                return
             try:
                 instance = queryset.get(pk=validated_data.get(pk))
                 self.instance = instance
@@ -27,10 +40,9 @@ class BaseNestableMixin(serializers.ModelSerializer):
             if self.instance is not None:
                 model_class = instance.__class__
                 if self.instance.pk != validated_data_pk:
-                    try:
-                        self.instance = model_class.objects.get(pk=validated_data_pk)
-                    except model_class.model.DoesNotExist:
-                        pass
+                    existing_instance = self._instance_cache.get(model_class, validated_data_pk)
+                    if existing_instance is not None:
+                        self.instance = existing_instance
 
     def __enter__(self):
         pass
@@ -1,29 +1,84 @@
-from copy import deepcopy
+from contextlib import contextmanager, nullcontext
+from functools import wraps
 from typing import List, Optional
 
 from django.contrib.contenttypes.models import ContentType
-from django.db import models
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models, router, transaction
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 from rest_framework.fields import empty
-from rest_framework.serializers import ListSerializer
+from rest_framework.serializers import ListSerializer, raise_errors_on_nested_writes
+from rest_framework.utils import model_meta
 
+from drf_nested.mixins.generic_relation_mixin import GenericRelationMixin
 from drf_nested.mixins.nestable_mixin import NestableMixin
 from drf_nested.mixins.through_mixin import ThroughMixin
-from drf_nested.utils import NestedInstanceExceptionHandler, NestedListExceptionHandler
+from drf_nested.mixins.unique_field_mixin import UniqueFieldMixin
+from drf_nested.mixins.unique_together_mixin import UniqueTogetherMixin
+from drf_nested.serializers import NestedListSerializerMixin
+from drf_nested.utils import (
+    REFRESH_ALWAYS,
+    STAGE_DELETE_DIFFERENCE,
+    STAGE_DIRECT_RELATIONS,
+    STAGE_GENERIC_RELATIONS,
+    STAGE_MANY_TO_MANY_FIELDS,
+    STAGE_REVERSE_RELATIONS,
+    STAGE_UNIQUE_VALIDATION,
+    NestedFieldPath,
+    NestedFieldSourceIndex,
+    NestedInstanceCache,
+    NestedInstanceExceptionHandler,
+    NestedListExceptionHandler,
+    NestedRelation,
+    NestedRelationPlan,
+    NestedSlowSaveRecorder,
+    NestedStatsRecorder,
+    NestedUnitOfWork,
+    dry_run_save,
+    nested_field_stage,
+    nested_stage,
+    planned_lookup,
+    planned_property,
+    refresh_instance,
+    refresh_instances,
+    validate_refresh_policy,
+)
+
+
+def nested_atomic(method):
+    """
+    Runs the `create/update` method of the nested serializer inside the atomic block,
+    which is skipped on the inner levels of the tree when the savepoints are disabled
+    """
+
+    @wraps(method)
+    def wrapped(self, *args, **kwargs):
+        with self._nested_atomic():
+            return method(self, *args, **kwargs)
+
+    return wrapped
 
 
-class BaseNestedMixin(serializers.ModelSerializer):
+class BaseNestedMixin(NestedListSerializerMixin, serializers.ModelSerializer):
     """
     Base class for nested serializers.
     Provides all the needed methods and properties for manipulating nested data.
     """
 
     populate_nested_initial_data: bool = False
+    plan_nested_writes: bool = False
+    nested_savepoints: bool = True
+    _nested_refresh_policy: Optional[str] = None
 
     def __init__(self, instance=None, data=empty, **kwargs):
         if "populate_nested_initial_data" in kwargs:
             self.populate_nested_initial_data = kwargs.pop("populate_nested_initial_data")
+        if "plan_nested_writes" in kwargs:
+            self.plan_nested_writes = kwargs.pop("plan_nested_writes")
+        if "nested_savepoints" in kwargs:
+            self.nested_savepoints = kwargs.pop("nested_savepoints")
 
         super().__init__(instance, data, **kwargs)
 
@@ -55,6 +110,109 @@ class BaseNestedMixin(serializers.ModelSerializer):
                         new_serializer = serializer(**serializer_kwargs)
                         self.fields[field_name] = new_serializer
 
+    def save(self, **kwargs):
+        """
+        Accepts `refresh_policy` to override the refresh policy for the whole nested tree.
+        With `dry_run=True` the save is rolled back and the report of its queries is returned.
+        """
+        if kwargs.pop("dry_run", False):
+            return dry_run_save(self, self.save, router.db_for_write(self.Meta.model), **kwargs)
+        refresh_policy = kwargs.pop("refresh_policy", None)
+        if refresh_policy is not None:
+            validate_refresh_policy(refresh_policy)
+        self._nested_refresh_policy = refresh_policy
+        try:
+            using = router.db_for_write(self.Meta.model)
+            with NestedStatsRecorder.record(self, self.__class__, using):
+                with NestedSlowSaveRecorder.record(self, self.__class__, using):
+                    return super().save(**kwargs)
+        finally:
+            self._nested_refresh_policy = None
+            if self.parent is None:
+                NestedInstanceCache.clear_for(self)
+                NestedUnitOfWork.clear_for(self)
+
+    @property
+    def _instance_cache(self) -> NestedInstanceCache:
+        """
+        Existing instances of the nested tree, shared by all its serializers
+        """
+        return NestedInstanceCache.for_serializer(self)
+
+    @property
+    def _unit_of_work(self) -> NestedUnitOfWork:
+        """
+        Writes collected from all the serializers of the nested tree
+        """
+        return NestedUnitOfWork.for_serializer(self)
+
+    def _flush_unit_of_work(self):
+        """
+        Executes the collected writes of the nested tree, if the serializer is the outermost nested one.
+        Writes of the `NestedListSerializer` items are executed by the list, once for all the items.
+        :return: None
+        """
+        if NestedUnitOfWork.is_owner(self):
+            self._unit_of_work.flush()
+
+    @property
+    def _is_nested_root(self) -> bool:
+        """
+        Indicates if the serializer is the outermost one, i.e. it is not a field of another serializer
+        """
+        if self.parent is None:
+            return True
+        return isinstance(self.parent, ListSerializer) and self.parent.parent is None
+
+    def _nested_atomic(self):
+        """
+        Opens the atomic block for the `create/update` of the serializer.
+        With `nested_savepoints = False` on the outermost serializer only the outermost level opens it,
+        the inner levels already running inside it skip the savepoints.
+        The whole tree is still saved or rolled back at once: errors of the inner levels are raised
+        by the outermost serializer, rolling back its block.
+        :return: context manager
+        """
+        if self._is_nested_root or not transaction.get_connection().in_atomic_block:
+            return transaction.atomic()
+        root = self.root
+        root_serializer = root.child if isinstance(root, ListSerializer) else root
+        if getattr(root_serializer, "nested_savepoints", True):
+            return transaction.atomic()
+        return nullcontext()
+
+    def _get_refresh_policy(self) -> str:
+        """
+        Gets the refresh policy for the instances saved by the serializer.
+        The policy given to `save()` wins over the `refresh_policy` of the serializer `Meta`,
+        which wins over the `refresh_policy` of the outermost serializer `Meta`.
+        :return: refresh policy
+        """
+        root = self.root
+        policy = getattr(root, "_nested_refresh_policy", None)
+        if policy is None:
+            policy = getattr(self.Meta, "refresh_policy", None)
+        if policy is None:
+            root_serializer = root.child if isinstance(root, ListSerializer) else root
+            policy = getattr(getattr(root_serializer, "Meta", None), "refresh_policy", None)
+        return policy or REFRESH_ALWAYS
+
+    def _refresh_instance(self, model_instance):
+        """
+        Reloads saved instance from the database according to the refresh policy
+        :param model_instance: saved model instance
+        :return: None
+        """
+        refresh_instance(model_instance, self._get_refresh_policy(), self._is_nested_root)
+
+    def _refresh_instances(self, model_instances: list):
+        """
+        Reloads saved instances from the database according to the refresh policy with a single query
+        :param model_instances: saved model instances
+        :return: None
+        """
+        refresh_instances(model_instances, self._get_refresh_policy(), self._is_nested_root)
+
     def _get_field_pk_value(self, field_name: str, nested_data):
         """
         Gets primary key value from given data for given serializer field name
@@ -78,6 +236,7 @@ class BaseNestedMixin(serializers.ModelSerializer):
                 return nested_data.get(pk_key)
         return None
 
+    @planned_lookup
     def _get_field_pk_name(self, field_name: str) -> str:
         """
         Gets primary key field name for given serializer field name
@@ -99,15 +258,36 @@ class BaseNestedMixin(serializers.ModelSerializer):
         :return: original data (possibly cleaned of the nested fields) and nested data
         """
         attr = "pop" if remove_fields else "get"
-        initial_data_copy = deepcopy(initial_data)
+        # Only the keys are copied, so the nested fields can be popped while iterating
         nested_fields = {
             field_name: initial_data.__getattribute__(attr)(field_name)
-            for field_name in initial_data_copy
-            if self.get_model_field_name(field_name) in self.nested_field_names
+            for field_name in list(initial_data)
+            if self.get_model_field_name(field_name) in self._nested_field_name_set
         }
         return initial_data, nested_fields
 
     @property
+    def _relation_plan(self) -> NestedRelationPlan:
+        """
+        Relation plan compiled for the current serializer fields.
+        The plan is shared by all the serializer instances with the same fields.
+        """
+        plan = self.__dict__.get("_nested_relation_plan")
+        if plan is None or self.__dict__.get("_nested_relation_plan_fields") is not self.fields:
+            plan = NestedRelationPlan.for_serializer(self)
+            self.__dict__["_nested_relation_plan"] = plan
+            self.__dict__["_nested_relation_plan_fields"] = self.fields
+        return plan
+
+    def invalidate_relation_plan(self):
+        """
+        Makes the serializer look up its relation plan again.
+        Should be called if the serializer fields are changed after the serializer was used.
+        """
+        self.__dict__.pop("_nested_relation_plan", None)
+        self.__dict__.pop("_nested_relation_plan_fields", None)
+
+    @planned_property
     def nested_field_names(self):
         return [
             self.get_model_field_name(name)
@@ -119,8 +299,52 @@ class BaseNestedMixin(serializers.ModelSerializer):
             ]
         ]
 
+    @planned_property
+    def _nested_field_name_set(self):
+        return frozenset(self.nested_field_names)
+
+    @planned_lookup
+    def _get_nested_relation(self, field_name: str) -> NestedRelation:
+        """
+        Gets the compiled relation information for the nested data key
+        :param field_name: field name or source used as the key in the nested data
+        :return: nested relation
+        """
+        model_field_name = self.get_model_field_name(field_name)
+        serializer_field_name = field_name if field_name in self.fields else model_field_name
+        kinds = tuple(
+            kind
+            for kind, names in (
+                ("direct_relations", self._serializer_direct_relation_names),
+                ("reverse_relations", self._serializer_reverse_relation_names),
+                ("generic_relations", self._serializer_generic_relation_names),
+                ("many_to_many_fields", self._serializer_many_to_many_field_names),
+            )
+            if model_field_name in names
+        )
+
+        serializer = self._get_serializer_by_field_name(serializer_field_name)
+        if issubclass(serializer.__class__, ListSerializer):
+            serializer = serializer.child
+        model = getattr(getattr(serializer, "Meta", None), "model", None)
+
+        try:
+            related_name = self.get_related_name(model_field_name)
+        except ValidationError:
+            related_name = None
+
+        return NestedRelation(
+            field_name=serializer_field_name,
+            model_field_name=model_field_name,
+            kinds=kinds,
+            pk_name=model._meta.pk.attname if model is not None else None,
+            related_name=related_name,
+            serializer_class=serializer.__class__,
+            read_only=self.fields.get(self.get_field_name_by_source(field_name)).read_only,
+        )
+
     # Direct relations
-    @property
+    @planned_property
     def _model_direct_relations(self) -> List:
         return [
             field
@@ -128,18 +352,18 @@ class BaseNestedMixin(serializers.ModelSerializer):
             if isinstance(field, models.ForeignKey)
         ]
 
-    @property
+    @planned_property
     def _model_direct_relation_names(self) -> List[str]:
         return [field.name for field in self._model_direct_relations]
 
-    @property
+    @planned_property
     def _serializer_direct_relation_names(self):
         return [
             self.get_model_field_name(field_name)
             for field_name in self._model_direct_relation_names
         ]
 
-    @property
+    @planned_property
     def direct_relations(self) -> List[str]:
         return [
             field_name
@@ -155,19 +379,60 @@ class BaseNestedMixin(serializers.ModelSerializer):
     def direct_relation_field_classes(self):
         return [serializers.PrimaryKeyRelatedField]
 
+    @nested_field_stage(STAGE_DIRECT_RELATIONS)
     def _update_or_create_direct_relations(self, field_name, data):
         serializer = self._get_serializer_by_field_name(field_name)
         pk = data.get(self._get_field_pk_name(field_name))
         with NestedInstanceExceptionHandler(field_name, self):
             if pk is not None:
-                nested_instance = serializer.Meta.model.objects.get(pk=pk)
+                nested_instance = self._get_existing_instance(serializer.Meta.model, pk)
                 direct_relation = serializer.update(nested_instance, data)
             else:
                 direct_relation = serializer.create(dict(data))
             return direct_relation
 
+    def _get_nested_instances(self, field_name: str, nested_data: list) -> dict:
+        """
+        Fetches all the existing instances referenced in the nested data with a single query
+        :param field_name: serializer field name
+        :param nested_data: list containing the nested data for given serializer field name
+        :return: existing model instances mapped by their primary key values
+        """
+        serializer = self._get_serializer_by_field_name(field_name)
+        model = serializer.child.Meta.model
+        pks = self._get_field_pk_value(field_name, nested_data)
+        if not pks:
+            return {}
+        return self._instance_cache.load(model, pks)
+
+    def _get_nested_instance(self, instances: dict, pk, field_name: str):
+        """
+        Gets existing instance for given primary key value from the fetched instances
+        :param instances: model instances mapped by their primary key values
+        :param pk: primary key value
+        :param field_name: serializer field name
+        :return: model instance
+        """
+        model = self._get_serializer_by_field_name(field_name).child.Meta.model
+        instance = instances.get(self._instance_cache.to_pk(model, pk))
+        if instance is None:
+            raise model.DoesNotExist("%s matching query does not exist." % model._meta.object_name)
+        return instance
+
+    def _get_existing_instance(self, model, pk):
+        """
+        Gets existing instance for given primary key value from the instance cache
+        :param model: model class
+        :param pk: primary key value
+        :return: model instance
+        """
+        instance = self._instance_cache.get(model, pk)
+        if instance is None:
+            raise model.DoesNotExist("%s matching query does not exist." % model._meta.object_name)
+        return instance
+
     # Reverse relations
-    @property
+    @planned_property
     def _model_reverse_relations(self) -> List:
         return [
             field
@@ -175,18 +440,18 @@ class BaseNestedMixin(serializers.ModelSerializer):
             if not isinstance(field, models.ManyToManyRel)
         ]
 
-    @property
+    @planned_property
     def _model_reverse_relation_names(self) -> List[str]:
         return [field.name for field in self._model_reverse_relations]
 
-    @property
+    @planned_property
     def _serializer_reverse_relation_names(self) -> List[str]:
         return [
             self.get_model_field_name(field_name)
             for field_name in self._model_reverse_relation_names
         ]
 
-    @property
+    @planned_property
     def reverse_relations(self) -> List[str]:
         return [
             field_name
@@ -218,6 +483,7 @@ class BaseNestedMixin(serializers.ModelSerializer):
             serializer = self.fields.get(self.get_field_name_by_source(field_name))
         return serializer
 
+    @nested_field_stage(STAGE_REVERSE_RELATIONS)
     def _update_or_create_reverse_relation(
         self, field_name, data: "list[dict] | dict", model_instance
     ):
@@ -226,6 +492,9 @@ class BaseNestedMixin(serializers.ModelSerializer):
 
         if issubclass(serializer.__class__, ListSerializer) and isinstance(data, list):
             serializer.child.partial = self.partial
+            if self._should_sync_through(serializer.child, data):
+                self._sync_through_items(field_name, serializer.child, data, model_instance)
+                return
 
             if self._should_be_deleted_on_update(field_name):
                 # Removing connected relations that are not provided in the data
@@ -233,38 +502,17 @@ class BaseNestedMixin(serializers.ModelSerializer):
                     model_instance, data, serializer.child.Meta.model, field_name
                 )
 
+            # Fetching all the existing instances referenced by the provided data at once
+            instances = self._get_nested_instances(field_name, data)
+
+            if not self._should_preserve_provided(serializer.child):
+                for item in data:
+                    item[related_name] = model_instance
+
             # If there is an instance that can be updated by the provided data - find
             # and use provided data to update existing instance.
             # In other case we add data to the list for further creation and create all the items at once
-            if hasattr(serializer.child, "initial_data"):
-                serializer_initial_data = deepcopy(serializer.child.initial_data)
-                for item, initial_item in zip(data, serializer.child.initial_data):
-                    with NestedListExceptionHandler(field_name, self):
-                        serializer.child.initial_data = initial_item
-                        if not self._should_preserve_provided(serializer.child):
-                            item[related_name] = model_instance
-                        pk = item.get(self._get_field_pk_name(field_name))
-
-                        if pk is not None:
-                            nested_instance = serializer.child.Meta.model.objects.get(pk=pk)
-                            serializer.child.update(nested_instance, item)
-                        else:
-                            serializer.child.create(item)
-
-                serializer.child.initial_data = serializer_initial_data
-
-            else:
-                for item in data:
-                    with NestedListExceptionHandler(field_name, self):
-                        if not self._should_preserve_provided(serializer.child):
-                            item[related_name] = model_instance
-                        pk = item.get(self._get_field_pk_name(field_name))
-
-                        if pk is not None:
-                            nested_instance = serializer.child.Meta.model.objects.get(pk=pk)
-                            serializer.child.update(nested_instance, item)
-                        else:
-                            serializer.child.create(item)
+            self._save_nested_items(field_name, serializer.child, data, instances, bulk_create=True)
         else:
             assert isinstance(data, dict)
             with NestedInstanceExceptionHandler(field_name, self):
@@ -272,13 +520,13 @@ class BaseNestedMixin(serializers.ModelSerializer):
                 if not self._should_preserve_provided(serializer):
                     data[related_name] = model_instance
                 if pk is not None:
-                    nested_instance = serializer.Meta.model.objects.get(pk=pk)
+                    nested_instance = self._get_existing_instance(serializer.Meta.model, pk)
                     serializer.update(nested_instance, data)
                 else:
                     serializer.create(dict(data))
 
     # Many-to-many fields
-    @property
+    @planned_property
     def _model_many_to_many_fields(self) -> List:
         reverse_related_m2m = [
             field
@@ -288,18 +536,18 @@ class BaseNestedMixin(serializers.ModelSerializer):
         regular_m2m = self.Meta.model._meta.many_to_many  # ty: ignore[unresolved-attribute]
         return [*regular_m2m, *reverse_related_m2m]
 
-    @property
+    @planned_property
     def _model_many_to_many_field_names(self) -> List[str]:
         return [field.name for field in self._model_many_to_many_fields]
 
-    @property
+    @planned_property
     def _serializer_many_to_many_field_names(self) -> List[str]:
         return [
             self.get_model_field_name(field_name)
             for field_name in self._model_many_to_many_field_names
         ]
 
-    @property
+    @planned_property
     def many_to_many_fields(self) -> List[str]:
         return [
             field_name
@@ -325,6 +573,7 @@ class BaseNestedMixin(serializers.ModelSerializer):
     def many_to_many_child_field_classes(self):
         return [serializers.PrimaryKeyRelatedField]
 
+    @nested_field_stage(STAGE_MANY_TO_MANY_FIELDS)
     def _update_or_create_many_to_many_field(
         self, field_name, data: "list[dict] | dict", model_instance
     ):
@@ -332,58 +581,51 @@ class BaseNestedMixin(serializers.ModelSerializer):
 
         if issubclass(serializer.__class__, ListSerializer) and isinstance(data, list):
             serializer.child.partial = self.partial
+            if self._should_sync_through(serializer.child, data):
+                # Through rows of the reverse relation to the through model are synchronised
+                # by the reverse relations pass
+                if "reverse_relations" not in self._get_nested_relation(field_name).kinds:
+                    self._sync_through_items(field_name, serializer.child, data, model_instance)
+                return
+
             related_name = None
             should_use_related_model_pk = False
             if issubclass(serializer.child.__class__, ThroughMixin):
                 related_name = serializer.child.related_name
                 should_use_related_model_pk = serializer.child.should_use_related_model_pk
 
-            if self._should_be_deleted_on_update(field_name):
+            sync_links = self._should_sync_many_to_many(
+                field_name, serializer.child, model_instance
+            )
+            if self._should_be_deleted_on_update(field_name) and not sync_links:
                 # Removing connected relations that are not provided in the data
                 self._delete_difference_on_update(
                     model_instance, data, serializer.child.Meta.model, field_name
                 )
 
+            # Fetching all the existing instances referenced by the provided data at once
+            instances = self._get_nested_instances(field_name, data)
+
+            if related_name and not self._should_preserve_provided(serializer):
+                for item in data:
+                    item[related_name] = (
+                        model_instance.pk if should_use_related_model_pk else model_instance
+                    )
+
             # If there is an instance that can be updated by the provided data - find
             # and use provided data to update existing instance.
             # In other case we create that item and connect all the items to the current model at once
-            items_to_add = []
-            if hasattr(serializer.child, "initial_data"):
-                serializer_initial_data = deepcopy(serializer.child.initial_data)
-                for item, initial_item in zip(data, serializer.child.initial_data):
-                    serializer.child.initial_data = initial_item
-                    if related_name and not self._should_preserve_provided(serializer):
-                        item[related_name] = (
-                            model_instance.pk if should_use_related_model_pk else model_instance
-                        )
-                    with NestedListExceptionHandler(field_name, self):
-                        pk = item.get(self._get_field_pk_name(field_name))
-                        if pk is not None:
-                            nested_instance = serializer.child.Meta.model.objects.get(pk=pk)
-                            nested_instance = serializer.child.update(nested_instance, item)
-                        else:
-                            nested_instance = serializer.child.create(dict(item))
-                        if nested_instance:
-                            items_to_add.append(nested_instance)
-                    serializer.child.initial_data = serializer_initial_data
-
-            else:
-                for item in data:
-                    with NestedListExceptionHandler(field_name, self):
-                        pk = item.get(self._get_field_pk_name(field_name))
-                        if related_name and not self._should_preserve_provided(serializer):
-                            item[related_name] = (
-                                model_instance.pk if should_use_related_model_pk else model_instance
-                            )
-                        if pk is not None:
-                            nested_instance = serializer.child.Meta.model.objects.get(pk=pk)
-                            nested_instance = serializer.child.update(nested_instance, item)
-                        else:
-                            nested_instance = serializer.child.create(dict(item))
-                        if nested_instance:
-                            items_to_add.append(nested_instance)
+            items_to_add = [
+                nested_instance
+                for nested_instance in self._save_nested_items(
+                    field_name, serializer.child, data, instances
+                )
+                if nested_instance
+            ]
 
-            if (
+            if sync_links:
+                self._sync_many_to_many_links(field_name, model_instance, items_to_add)
+            elif (
                 not issubclass(serializer.child.__class__, ThroughMixin)
                 or serializer.child.connect_to_model
             ) and not self._should_preserve_provided(serializer.child):
@@ -391,23 +633,83 @@ class BaseNestedMixin(serializers.ModelSerializer):
                     *items_to_add
                 )
 
+    def _should_sync_many_to_many(self, field_name: str, serializer, model_instance) -> bool:
+        """
+        Indicates if the links of the many-to-many field should be synchronised with the nested data
+        by the difference with the existing links, instead of the `remove()` and `add()` calls
+        :param field_name: field name
+        :param serializer: nested child serializer
+        :param model_instance: instance the links belong to
+        :return: if the links should be synchronised
+        """
+        if not isinstance(serializer, NestableMixin) or not serializer.sync_many_to_many:
+            return False
+        if isinstance(serializer, ThroughMixin) or self._should_preserve_provided(serializer):
+            return False
+        related_manager = getattr(model_instance, self.get_model_field_name(field_name))
+        through = getattr(related_manager, "through", None)
+        return through is not None and through._meta.auto_created
+
+    def _sync_many_to_many_links(self, field_name: str, model_instance, related_instances: list):
+        """
+        Computes the difference between the existing links of the many-to-many field and the saved
+        nested instances with a single query against the through model, then inserts the missing
+        links with a single bulk insert and, unless the update is partial, removes the redundant
+        links with a single delete. Existing links are not touched.
+        Note that `m2m_changed` signals are not sent.
+        :param field_name: field name
+        :param model_instance: instance the links belong to
+        :param related_instances: saved nested instances
+        :return: None
+        """
+        if self._errors:
+            return
+        related_manager = getattr(model_instance, self.get_model_field_name(field_name))
+        through = related_manager.through
+        source_name = through._meta.get_field(related_manager.source_field_name).attname
+        target_name = through._meta.get_field(related_manager.target_field_name).attname
+        links = through._default_manager.filter(**{source_name: model_instance.pk})
+
+        existing_targets = set(links.values_list(target_name, flat=True))
+        # Ordered and deduplicated primary keys of the provided targets
+        provided_targets = dict.fromkeys(
+            related_instance.pk for related_instance in related_instances
+        )
+
+        if self._should_be_deleted_on_update(field_name):
+            targets_to_delete = existing_targets.difference(provided_targets)
+            with nested_stage(self, STAGE_DELETE_DIFFERENCE, count=len(targets_to_delete)):
+                if targets_to_delete:
+                    links.filter(**{"%s__in" % target_name: targets_to_delete})._raw_delete(
+                        links.db
+                    )
+
+        links_to_create = [
+            through(**{source_name: model_instance.pk, target_name: target})
+            for target in provided_targets
+            if target not in existing_targets
+        ]
+        if links_to_create:
+            with NestedStatsRecorder.record_bulk_write("insert", [None] * len(links_to_create)):
+                through._default_manager.bulk_create(links_to_create)
+
     # Generic relations
-    @property
+    @planned_property
     def _model_generic_relations(self) -> List:
         return self.Meta.model._meta.private_fields  # ty: ignore[unresolved-attribute]
 
-    @property
+    @planned_property
     def _model_generic_relation_names(self) -> List[str]:
         return [field.name for field in self._model_generic_relations]
 
-    @property
+    @planned_property
     def _serializer_generic_relation_names(self) -> List[str]:
         return [
             self.get_model_field_name(field_name)
             for field_name in self._model_generic_relation_names
         ]
 
-    @property
+    @planned_property
     def generic_relations(self) -> List[str]:
         return [
             field_name
@@ -415,34 +717,103 @@ class BaseNestedMixin(serializers.ModelSerializer):
             if self.get_model_field_name(field_name) in self._serializer_generic_relation_names
         ]
 
-    def _update_or_create_generic_relation(self, field_name, data, model_instance):
+    @nested_field_stage(STAGE_GENERIC_RELATIONS)
+    def _update_or_create_generic_relation(
+        self, field_name, data, model_instance, created: bool = False
+    ):
         serializer = self._get_serializer_by_field_name(field_name)
         if issubclass(serializer.__class__, ListSerializer) and isinstance(data, list):
             serializer.child.partial = self.partial
+            model = serializer.child.Meta.model
+            content_type, content_type_name, object_id_name = self._get_generic_relation_fields(
+                field_name, model_instance.__class__, model_instance._state.db
+            )
+
+            # Connected instances are fetched with a single query, unless they are preloaded
+            # for all the items of the list. Instance created by this save has none of them.
+            if created:
+                instances = {}
+            else:
+                connected = self._instance_cache.load_generic(
+                    model, content_type_name, object_id_name, content_type.pk, [model_instance.pk]
+                )
+                instances = dict(next(iter(connected.values()), {}))
+            connected_pks = set(instances)
+            # Fetching all the other instances referenced by the provided data at once
+            instances.update(self._get_nested_instances(field_name, data))
 
             if self._should_be_deleted_on_update(field_name):
                 # Removing connected relations that are not provided in the data
-                self._delete_difference_on_update(
-                    model_instance, data, serializer.child.Meta.model, field_name
+                pk_name = self._get_field_pk_name(field_name)
+                provided_pks = set(
+                    self._instance_cache.to_pk(model, item.get(pk_name)) for item in data
                 )
+                pks_to_delete = [pk for pk in connected_pks if pk not in provided_pks]
+                with nested_stage(self, STAGE_DELETE_DIFFERENCE, count=len(pks_to_delete)):
+                    self._delete_instances(model, pks_to_delete, field_name)
 
-            for item in data:
-                with NestedListExceptionHandler(field_name, self):
-                    content_type = ContentType.objects.get_for_model(model_instance.__class__)
-                    # Setting special for GenericRelation model fields
-                    if not self._should_preserve_provided(serializer.child):
-                        item.update(
-                            {
-                                "content_type_id": content_type.id,
-                                "object_id": model_instance.id,
-                            }
-                        )
-                    pk = item.get(self._get_field_pk_name(field_name))
-                    if pk is not None:
-                        nested_instance = serializer.child.Meta.model.objects.get(pk=pk)
-                        serializer.child.update(nested_instance, item)
-                    else:
-                        serializer.child.create(dict(item))
+            # Setting special for GenericRelation model fields
+            if not self._should_preserve_provided(serializer.child):
+                for item in data:
+                    item.update(
+                        {content_type_name: content_type.pk, object_id_name: model_instance.pk}
+                    )
+
+            self._save_nested_items(field_name, serializer.child, data, instances, bulk_create=True)
+
+    def _get_generic_relation_fields(self, field_name: str, model_class, using=None) -> tuple:
+        """
+        Gets the content type of the model and the fields of the generic relation
+        :param field_name: generic relation field name
+        :param model_class: model class of the connected objects
+        :param using: database alias
+        :return: content type, content type foreign key attribute name and object id field name
+        """
+        field = self._get_serializer_by_field_name(field_name)
+        serializer = field.child if isinstance(field, ListSerializer) else field
+        model = serializer.Meta.model
+        # Generic relation serializers have no write source, so the field source names the relation
+        generic_field = model_class._meta.get_field(
+            getattr(serializer, "write_source", None) or field.source
+        )
+        content_type = ContentType.objects.db_manager(using).get_for_model(
+            model_class, for_concrete_model=generic_field.for_concrete_model
+        )
+        return (
+            content_type,
+            model._meta.get_field(generic_field.content_type_field_name).attname,
+            generic_field.object_id_field_name,
+        )
+
+    def _preload_generic_relations(self, items: list):
+        """
+        Fetches the instances connected by the generic relations to all the existing instances
+        referenced by the list items with a single query per generic relation field
+        :param items: validated items of the list serializer
+        :return: None
+        """
+        pk_name = self.Meta.model._meta.pk.attname
+        object_ids = [item.get(pk_name) for item in items if isinstance(item, dict)]
+        if not any(object_id is not None for object_id in object_ids):
+            return
+        for field_name in self.generic_relations:
+            serializer = self._get_serializer_by_field_name(field_name)
+            # Validated items are keyed by the field source
+            if not isinstance(serializer, ListSerializer) or not any(
+                isinstance(item, dict) and isinstance(item.get(serializer.source), list)
+                for item in items
+            ):
+                continue
+            content_type, content_type_name, object_id_name = self._get_generic_relation_fields(
+                field_name, self.Meta.model, router.db_for_write(self.Meta.model)
+            )
+            self._instance_cache.load_generic(
+                serializer.child.Meta.model,
+                content_type_name,
+                object_id_name,
+                content_type.pk,
+                object_ids,
+            )
 
     # Helper functions
 
@@ -462,11 +833,418 @@ class BaseNestedMixin(serializers.ModelSerializer):
         return None
 
     def _is_field_nested(self, field_name):
-        return self.get_model_field_name(field_name) in self.nested_field_names
+        return self.get_model_field_name(field_name) in self._nested_field_name_set
 
     def _has_nested_fields(self, validated_data):
-        fields = [self.get_model_field_name(field_name) for field_name in validated_data]
-        return any([field in self.nested_field_names for field in fields])
+        nested_field_names = self._nested_field_name_set
+        return any(
+            self.get_model_field_name(field_name) in nested_field_names
+            for field_name in validated_data
+        )
+
+    def _iterate_nested_items(self, serializer, data):
+        """
+        Iterates over the nested items, setting the matching item of the serializer `initial_data`
+        for every one of them, if the serializer was populated with the initial data
+        :param serializer: nested child serializer
+        :param data: list of nested items
+        :return: generator of nested items
+        """
+        if not hasattr(serializer, "initial_data"):
+            yield from data
+            return
+
+        # The list itself is never modified, so keeping the reference is enough to restore it
+        serializer_initial_data = serializer.initial_data
+        try:
+            for item, initial_item in zip(data, serializer.initial_data):
+                serializer.initial_data = initial_item
+                yield item
+        finally:
+            serializer.initial_data = serializer_initial_data
+
+    def _save_nested_items(
+        self, field_name: str, serializer, data: list, instances: dict, bulk_create: bool = False
+    ) -> list:
+        """
+        Updates the existing or creates the new instances for every item of the nested list.
+        Errors are collected per item, the items that can be written in bulk are saved at the end.
+        :param field_name: serializer field name
+        :param serializer: nested child serializer
+        :param data: list of validated nested items
+        :param instances: existing instances mapped by their primary key values
+        :param bulk_create: indicator whether new items could be inserted with `bulk_create`
+        :return: saved instances in the order of the items, `None` for the failed items
+        """
+        saved_instances = []
+        instances_to_create = []
+        instances_to_update = []
+        with self._validate_unique_in_batch(serializer, data) as unique_errors:
+            for index, item in enumerate(self._iterate_nested_items(serializer, data)):
+                saved_instance = None
+                with NestedListExceptionHandler(field_name, self):
+                    if index in unique_errors:
+                        raise unique_errors[index]
+
+                    pk = item.get(self._get_field_pk_name(field_name))
+                    if pk is not None:
+                        nested_instance = self._get_nested_instance(instances, pk, field_name)
+                        if self._should_bulk_update(serializer, item):
+                            changed_item = self._get_changed_values(nested_instance, item)
+                            self._get_bulk_update_instance(serializer, nested_instance, item)
+                            instances_to_update.append((nested_instance, changed_item))
+                        else:
+                            nested_instance = serializer.update(nested_instance, item)
+                    elif bulk_create and self._should_bulk_create(serializer, item):
+                        nested_instance = self._get_bulk_create_instance(serializer, item)
+                        instances_to_create.append(nested_instance)
+                    else:
+                        nested_instance = serializer.create(dict(item))
+                    saved_instance = nested_instance
+                saved_instances.append(saved_instance)
+
+            self._bulk_create_instances(serializer, instances_to_create)
+            self._bulk_update_instances(serializer, instances_to_update)
+        return saved_instances
+
+    def _get_through_fields(self, model_class) -> Optional[tuple]:
+        """
+        Gets the foreign keys of the through model of the many-to-many field of the serializer model
+        :param model_class: through model class
+        :return: names of the foreign keys to the serializer model and to the target model
+        or `None`, if the model is not a through model of the serializer model
+        """
+        for field in self._model_many_to_many_fields:
+            many_to_many_field = field.field if isinstance(field, models.ManyToManyRel) else field
+            if many_to_many_field.remote_field.through is not model_class:
+                continue
+            if isinstance(field, models.ManyToManyRel):
+                return (
+                    many_to_many_field.m2m_reverse_field_name(),
+                    many_to_many_field.m2m_field_name(),
+                )
+            return many_to_many_field.m2m_field_name(), many_to_many_field.m2m_reverse_field_name()
+        return None
+
+    def _should_sync_through(self, serializer, data: list) -> bool:
+        """
+        Indicates if the through model items should be synchronised in bulk by their target,
+        instead of the serializer `create/update` calls
+        :param serializer: nested child serializer
+        :param data: list of validated nested items
+        :return: if the items should be synchronised in bulk
+        """
+        if not isinstance(serializer, ThroughMixin) or not serializer.bulk_through:
+            return False
+        if isinstance(serializer, (UniqueFieldMixin, UniqueTogetherMixin)):
+            return False
+        if self._should_preserve_provided(serializer) or any(
+            self._has_custom_method(serializer, method_name) for method_name in ("create", "update")
+        ):
+            return False
+        if isinstance(serializer, NestableMixin) and not (
+            serializer.allow_create and serializer.allow_update
+        ):
+            return False
+        if self._get_through_fields(serializer.Meta.model) is None:
+            return False
+        return all(
+            isinstance(item, dict) and self._can_be_written_in_bulk(serializer, item)
+            for item in data
+        )
+
+    def _sync_through_items(self, field_name: str, serializer, data: list, model_instance):
+        """
+        Synchronises the through model rows of the instance with the nested items by their target:
+        loads the existing rows with a single query, inserts the missing rows, updates the rows
+        with the changed extra columns and deletes the rows of the targets missing in the data,
+        one bulk query for every operation
+        :param field_name: serializer field name
+        :param serializer: nested child serializer
+        :param data: list of validated nested items
+        :param model_instance: instance the through rows belong to
+        :return: None
+        """
+        model = serializer.Meta.model
+        source_name, target_name = self._get_through_fields(model)
+        source_field = model._meta.get_field(source_name)
+        target_field = model._meta.get_field(target_name)
+        extra_fields = [
+            field.attname
+            for field in model._meta.concrete_fields
+            if not field.primary_key and field not in (source_field, target_field)
+        ]
+
+        existing_rows = {
+            row[target_field.attname]: row
+            for row in model._default_manager.filter(
+                **{source_field.attname: model_instance.pk}
+            ).values(model._meta.pk.attname, target_field.attname, *extra_fields)
+        }
+
+        provided_targets = set()
+        rows_to_create = {}
+        rows_to_update = {}
+        for item in data:
+            with NestedListExceptionHandler(field_name, self):
+                target = item.get(target_field.attname, item.get(target_name))
+                if isinstance(target, models.Model):
+                    target = target.pk
+                if target is None:
+                    raise ValidationError({target_field.attname: [_("This field is required.")]})
+                target = target_field.target_field.to_python(target)
+                provided_targets.add(target)
+                values = {}
+                for attr, value in item.items():
+                    try:
+                        field = model._meta.get_field(attr)
+                    except FieldDoesNotExist:
+                        continue
+                    if field.attname in extra_fields:
+                        values[field.attname] = value
+                existing_row = existing_rows.get(target)
+                if existing_row is None:
+                    rows_to_create[target] = model(
+                        **{source_field.attname: model_instance.pk, target_field.attname: target},
+                        **values,
+                    )
+                elif any(existing_row[attr] != value for attr, value in values.items()):
+                    rows_to_update[target] = (
+                        model(pk=existing_row[model._meta.pk.attname], **values),
+                        list(values),
+                    )
+
+        if self._errors:
+            return
+
+        if self._should_be_deleted_on_update(field_name):
+            stale_pks = [
+                row[model._meta.pk.attname]
+                for target, row in existing_rows.items()
+                if target not in provided_targets
+            ]
+            with nested_stage(self, STAGE_DELETE_DIFFERENCE, count=len(stale_pks)):
+                if stale_pks:
+                    queryset = model._default_manager.filter(pk__in=stale_pks)
+                    if self._should_fast_delete(field_name):
+                        queryset._raw_delete(queryset.db)
+                    else:
+                        queryset.delete()
+
+        batch_size = getattr(serializer, "bulk_batch_size", None)
+        path = str(NestedFieldPath.for_serializer(self))
+        if rows_to_create:
+            self._unit_of_work.register_create(
+                model, list(rows_to_create.values()), batch_size, path
+            )
+        for instance, update_fields in rows_to_update.values():
+            self._unit_of_work.register_update(model, instance, update_fields, batch_size, path)
+
+    @contextmanager
+    def _validate_unique_in_batch(self, serializer, data: list):
+        """
+        Runs unique and unique together validation for all the nested items at once and disables
+        the per-item validation of the serializer `create`/`update` calls
+        :param serializer: nested child serializer
+        :param data: list of validated nested items
+        :return: context manager, providing validation errors mapped by the item index
+        """
+        errors = {}
+        validate_unique = (
+            isinstance(serializer, UniqueFieldMixin) and serializer.batch_unique_validation
+        )
+        validate_unique_together = (
+            isinstance(serializer, UniqueTogetherMixin)
+            and serializer.batch_unique_together_validation
+        )
+        if validate_unique or validate_unique_together:
+            with nested_stage(self, STAGE_UNIQUE_VALIDATION, count=len(data)):
+                if validate_unique:
+                    errors.update(serializer._validate_unique_many(data))
+                if validate_unique_together:
+                    for index, error in serializer._validate_unique_together_many(data).items():
+                        errors.setdefault(index, error)
+        if validate_unique:
+            serializer._skip_unique_validation = True
+        if validate_unique_together:
+            serializer._skip_unique_together_validation = True
+        try:
+            yield errors
+        finally:
+            if validate_unique:
+                serializer._skip_unique_validation = False
+            if validate_unique_together:
+                serializer._skip_unique_together_validation = False
+
+    def _should_bulk_create(self, serializer, item) -> bool:
+        """
+        Indicates if the nested item can be inserted with a single `bulk_create` together with
+        the other new items of the list, instead of the serializer `create` call.
+        Serializers with custom `create` or items with their own nested data are always created
+        one by one.
+        :param serializer: nested child serializer
+        :param item: validated nested item
+        :return: if the item should be created in bulk
+        """
+        if not self._supports_bulk_writes(serializer) or not serializer.bulk_create:
+            return False
+        if not getattr(serializer, "allow_create", True) or self._has_custom_method(
+            serializer, "create"
+        ):
+            return False
+        return self._can_be_written_in_bulk(serializer, item)
+
+    def _should_bulk_update(self, serializer, item) -> bool:
+        """
+        Indicates if the existing nested instance can be written with a single `bulk_update`
+        together with the other updated items of the list, instead of the serializer `update` call.
+        Serializers with custom `update` or items with their own nested data are always updated
+        one by one.
+        :param serializer: nested child serializer
+        :param item: validated nested item
+        :return: if the item should be updated in bulk
+        """
+        if not self._supports_bulk_writes(serializer) or not serializer.bulk_update:
+            return False
+        if not getattr(serializer, "allow_update", True) or self._has_custom_method(
+            serializer, "update"
+        ):
+            return False
+        return self._can_be_written_in_bulk(serializer, item)
+
+    def _supports_bulk_writes(self, serializer) -> bool:
+        """
+        Nestable and generic relation serializers write in bulk when it is enabled on them,
+        unless the model has custom `save` or multi-table inheritance parents
+        """
+        if not isinstance(serializer, (NestableMixin, GenericRelationMixin)):
+            return False
+        model = serializer.Meta.model
+        return model.save is models.Model.save and not model._meta.parents
+
+    def _can_be_written_in_bulk(self, serializer, item) -> bool:
+        if isinstance(serializer, BaseNestedMixin) and serializer._has_nested_fields(item):
+            return False
+        field_info = model_meta.get_field_info(serializer.Meta.model)
+        return not any(
+            relation_info.to_many and field_name in item
+            for field_name, relation_info in field_info.relations.items()
+        )
+
+    def _has_custom_method(self, serializer, method_name: str) -> bool:
+        """
+        Checks if the serializer method is overridden outside of this package and DRF
+        :param serializer: serializer instance
+        :param method_name: method name
+        :return: if the method is overridden
+        """
+        for klass in serializer.__class__.__mro__:
+            if method_name in vars(klass) and not klass.__module__.startswith(
+                ("drf_nested.", "rest_framework.")
+            ):
+                return True
+        return False
+
+    def _get_bulk_create_instance(self, serializer, item):
+        """
+        Runs the checks that the serializer `create` call would run and returns unsaved instance
+        :param serializer: nested child serializer
+        :param item: validated nested item
+        :return: unsaved model instance
+        """
+        if isinstance(serializer, UniqueFieldMixin):
+            serializer._run_unique_validation(item)
+        if isinstance(serializer, UniqueTogetherMixin):
+            serializer._run_unique_together_validation(item)
+        raise_errors_on_nested_writes("create", serializer, item)
+        return serializer.Meta.model(**item)
+
+    def _get_bulk_update_instance(self, serializer, instance, item):
+        """
+        Runs the checks that the serializer `update` call would run and applies the item to the instance
+        :param serializer: nested child serializer
+        :param instance: existing model instance
+        :param item: validated nested item
+        :return: modified, but not saved model instance
+        """
+        if isinstance(serializer, UniqueFieldMixin):
+            serializer._run_unique_validation(item)
+        if isinstance(serializer, UniqueTogetherMixin):
+            serializer._run_unique_together_validation(item)
+        raise_errors_on_nested_writes("update", serializer, item)
+        for attr, value in item.items():
+            setattr(instance, attr, value)
+        return instance
+
+    def _get_changed_values(self, instance, item: dict) -> dict:
+        """
+        Gets the values of the nested item that differ from the values of the existing instance
+        :param instance: existing model instance
+        :param item: validated nested item
+        :return: changed values
+        """
+        missing = object()
+        changed = {}
+        for attr, value in item.items():
+            try:
+                field = instance._meta.get_field(attr)
+            except FieldDoesNotExist:
+                field = None
+            if field is not None and field.concrete and field.is_relation:
+                # Comparing the foreign key values, not to fetch the related instances
+                current = getattr(instance, field.attname)
+                if isinstance(value, models.Model):
+                    value = value.pk
+            else:
+                current = getattr(instance, attr, missing)
+            if current != value:
+                changed[attr] = item[attr]
+        return changed
+
+    def _bulk_create_instances(self, serializer, instances_to_create: list):
+        """
+        Registers all the collected instances to be inserted at once, when the outermost serializer
+        flushes the unit of work. Inserts are chunked by serializer `bulk_batch_size`.
+        :param serializer: nested child serializer
+        :param instances_to_create: unsaved model instances
+        :return: None
+        """
+        if not instances_to_create or self._errors:
+            return
+        self._unit_of_work.register_create(
+            serializer.Meta.model,
+            instances_to_create,
+            serializer.bulk_batch_size,
+            str(NestedFieldPath.for_serializer(self)),
+        )
+
+    def _bulk_update_instances(self, serializer, instances_to_update: list):
+        """
+        Registers all the collected instances to be written at once, when the outermost serializer
+        flushes the unit of work. Updates are chunked by serializer `bulk_batch_size`.
+        Only the columns changed by the nested data are updated, unchanged instances are not written.
+        :param serializer: nested child serializer
+        :param instances_to_update: pairs of modified model instance and its changed values
+        :return: None
+        """
+        if not instances_to_update or self._errors:
+            return
+        model = serializer.Meta.model
+        path = str(NestedFieldPath.for_serializer(self))
+        for instance, item in instances_to_update:
+            update_fields = []
+            for attr in item:
+                try:
+                    field = model._meta.get_field(attr)
+                except FieldDoesNotExist:
+                    continue
+                if field.concrete and not field.primary_key:
+                    update_fields.append(field.name)
+            if not update_fields:
+                continue
+            self._unit_of_work.register_update(
+                model, instance, update_fields, serializer.bulk_batch_size, path
+            )
 
     def _should_preserve_provided(self, serializer):
         return isinstance(serializer, NestableMixin) and serializer.preserve_provided
@@ -481,29 +1259,73 @@ class BaseNestedMixin(serializers.ModelSerializer):
         :return: None
         """
         if isinstance(objects, list):
-            objects_to_delete = list(
-                set([item.pk for item in instance.__getattribute__(field_name).all()])
-                - set([item.get(self._get_field_pk_name(field_name)) for item in objects])
-            )
-
-            if field_name not in self.many_to_many_fields:
-                for object_id in objects_to_delete:
-                    if object_id:
-                        try:
-                            model_class.objects.get(pk=object_id).delete()
+            # The stage count is the number of the deleted objects
+            with nested_stage(self, STAGE_DELETE_DIFFERENCE, count=0) as stage:
+                related_manager = instance.__getattribute__(field_name)
+                pk_field = model_class._meta.pk
+                pk_key = self._get_field_pk_name(field_name)
+                provided_ids = set(
+                    pk_field.to_python(item.get(pk_key))
+                    for item in objects
+                    if item.get(pk_key) is not None
+                )
+                objects_to_delete = [
+                    object_id
+                    for object_id in related_manager.values_list("pk", flat=True)
+                    if object_id and object_id not in provided_ids
+                ]
+                if stage is not None:
+                    stage.count = len(objects_to_delete)
+                if not objects_to_delete:
+                    return
+
+                fast_delete = self._should_fast_delete(field_name)
+                if field_name not in self.many_to_many_fields:
+                    self._delete_instances(model_class, objects_to_delete, field_name)
+                elif fast_delete and hasattr(related_manager, "through"):
+                    queryset = related_manager.through._default_manager.filter(
+                        **{
+                            related_manager.source_field_name: instance.pk,
+                            "%s__in" % related_manager.target_field_name: objects_to_delete,
+                        }
+                    )
+                    queryset._raw_delete(queryset.db)
+                elif hasattr(related_manager, "remove"):
+                    related_manager.remove(*objects_to_delete)
+
+    def _delete_instances(self, model_class, pks: list, field_name: str):
+        """
+        Deletes the related objects with a single query
+        :param model_class: related model class
+        :param pks: primary key values of the objects to delete
+        :param field_name: field name
+        :return: None
+        """
+        if not pks:
+            return
+        queryset = model_class._default_manager.filter(pk__in=pks)
+        if self._should_fast_delete(field_name):
+            queryset._raw_delete(queryset.db)
+        elif model_class.delete is not models.Model.delete:
+            # Custom `delete` implementation should be called for every instance
+            for nested_instance in queryset:
+                nested_instance.delete()
+        else:
+            queryset.delete()
 
-                        except model_class.DoesNotExist:
-                            pass
-            else:
-                for object_id in objects_to_delete:
-                    if object_id:
-                        try:
-                            instance.__getattribute__(field_name).remove(
-                                model_class.objects.get(pk=object_id)
-                            )
-                        except (model_class.DoesNotExist, AttributeError):
-                            pass
+    def _should_fast_delete(self, field_name) -> bool:
+        """
+        Indicates if the redundant related objects should be removed with a single raw `DELETE`,
+        skipping the signals and the cascades that are handled by Django.
+        :param field_name: field name
+        :return: if the field should be cleaned with fast delete
+        """
+        serializer = self._get_serializer_by_field_name(field_name)
+        if issubclass(serializer.__class__, ListSerializer):
+            serializer = serializer.child
+        return isinstance(serializer, NestableMixin) and serializer.fast_delete
 
+    @planned_lookup
     def get_related_name(self, field_name: str) -> Optional[str]:
         """
         Gets related model field name using serializer field name
@@ -527,22 +1349,35 @@ class BaseNestedMixin(serializers.ModelSerializer):
             raise ValidationError({field_name: ["No related name."]})
         return related_field
 
+    @planned_property
+    def _field_source_index(self) -> NestedFieldSourceIndex:
+        """
+        Index of the serializer field names, sources and write sources, built once for the fields
+        """
+        index = NestedFieldSourceIndex()
+        for key, value in self.fields.items():
+            actual_value = value
+            if isinstance(value, ListSerializer):
+                actual_value = value.child
+            write_source = None
+            if isinstance(actual_value, NestableMixin):
+                write_source = actual_value.write_source
+            index.add(key, actual_value.source, write_source)
+        return index
+
+    @planned_lookup
     def get_model_field_name(self, field_name) -> str:
         """
         Gets corresponding model field name using serializer field name
         :param field_name: field name
         :return: model field name
         """
-        serializer = self.fields.get(field_name)
-        if serializer is None:
+        index = self._field_source_index
+        if field_name not in index.field_names:
             source = self.get_field_name_by_source(field_name)
             if source != field_name:
                 return self.get_model_field_name(source)
-        if issubclass(serializer.__class__, ListSerializer):
-            serializer = serializer.child
-        if issubclass(serializer.__class__, NestableMixin) and serializer.write_source is not None:
-            return serializer.write_source
-        return field_name
+        return index.write_sources.get(field_name, field_name)
 
     def get_field_name_by_source(self, source) -> str:
         """
@@ -550,15 +1385,7 @@ class BaseNestedMixin(serializers.ModelSerializer):
         :param source: serializer source
         :return: field name
         """
-        for key, value in self.fields.items():
-            actual_value = value
-            if isinstance(value, ListSerializer):
-                actual_value = value.child
-            if actual_value.source == source:
-                return key
-            elif isinstance(actual_value, NestableMixin) and actual_value.write_source == source:
-                return key
-        return source
+        return self._field_source_index.source_to_field_name.get(source, source)
 
     def extract_nested_types(self, nested_fields_data) -> dict:
         """
@@ -573,49 +1400,16 @@ class BaseNestedMixin(serializers.ModelSerializer):
             "many_to_many_fields": [],
         }
         for field_name, field_value in nested_fields_data.items():
-            original_name = field_name
-            model_field_name = self.get_model_field_name(field_name)
-
-            if field_name not in self.fields:
-                field_name = model_field_name
-
-            field_by_source = self.get_field_name_by_source(original_name)
-            if self.fields.get(field_by_source).read_only:
+            relation = self._get_nested_relation(field_name)
+            if relation.read_only:
                 continue
 
-            if model_field_name in self._serializer_direct_relation_names:
-                types["direct_relations"].append(
-                    {
-                        "name": field_name,
-                        "data": field_value,
-                        "original_name": original_name,
-                    }
-                )
-
-            if model_field_name in self._serializer_reverse_relation_names:
-                types["reverse_relations"].append(
-                    {
-                        "name": field_name,
-                        "data": field_value,
-                        "original_name": original_name,
-                    }
-                )
-
-            if model_field_name in self._serializer_generic_relation_names:
-                types["generic_relations"].append(
-                    {
-                        "name": field_name,
-                        "data": field_value,
-                        "original_name": original_name,
-                    }
-                )
-
-            if model_field_name in self._serializer_many_to_many_field_names:
-                types["many_to_many_fields"].append(
+            for kind in relation.kinds:
+                types[kind].append(
                     {
-                        "name": field_name,
+                        "name": relation.field_name,
                         "data": field_value,
-                        "original_name": original_name,
+                        "original_name": field_name,
                     }
                 )
 
@@ -623,3 +1417,4 @@ class BaseNestedMixin(serializers.ModelSerializer):
 
     class Meta:
         model: type[models.Model]
+        refresh_policy: Optional[str]
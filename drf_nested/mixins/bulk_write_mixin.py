@@ -0,0 +1,27 @@
+from typing import Optional
+
+from rest_framework.fields import empty
+
+from drf_nested.mixins.base_nestable_mixin import BaseNestableMixin
+
+
+class BulkWriteMixin(BaseNestableMixin):
+    """
+    Opt-in bulk writes of the nested list items saved by the serializer:
+    `bulk_create` inserts the new items and `bulk_update` writes the modified ones
+    with a single query, in chunks of `bulk_batch_size`
+    """
+
+    bulk_create: bool = False
+    bulk_update: bool = False
+    bulk_batch_size: Optional[int] = None
+
+    def __init__(self, instance=None, data=empty, **kwargs):
+        if "bulk_create" in kwargs:
+            self.bulk_create = kwargs.pop("bulk_create")
+        if "bulk_update" in kwargs:
+            self.bulk_update = kwargs.pop("bulk_update")
+        if "bulk_batch_size" in kwargs:
+            self.bulk_batch_size = kwargs.pop("bulk_batch_size")
+
+        super().__init__(instance, data, **kwargs)
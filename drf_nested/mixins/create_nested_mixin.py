@@ -1,9 +1,10 @@
-from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 from rest_framework.exceptions import ValidationError
 from rest_framework.fields import empty
 
-from drf_nested.mixins.base_nested_mixin import BaseNestedMixin
+from drf_nested.mixins.base_nested_mixin import BaseNestedMixin, nested_atomic
+from drf_nested.utils import STAGE_EXTRACT_NESTED, STAGE_SAVE_INSTANCE, nested_stage
+from drf_nested.write_planner import NestedWritePlanner
 
 
 class CreateNestedMixin(BaseNestedMixin):
@@ -12,24 +13,32 @@ class CreateNestedMixin(BaseNestedMixin):
         if not hasattr(self.Meta, "forbidden_on_create"):
             setattr(self.Meta, "forbidden_on_create", [])
 
-    @transaction.atomic
+    @nested_atomic
     def create(self, validated_data):
         """
         :param validated_data:
         :return:
         """
         self._errors = {}
+        if self._should_plan_writes(validated_data):
+            plan = NestedWritePlanner(self).plan([validated_data])
+            if plan is not None:
+                (model_instance,) = plan.execute()
+                self._refresh_instance(model_instance)
+                return model_instance
+
         if self._has_nested_fields(validated_data):
             if any([self._is_field_forbidden(request_field) for request_field in validated_data]):
                 raise ValidationError(
                     {"nested_field": [_("Nested fields are not allowed on create.")]}
                 )
 
-            validated_data, nested_fields_data = self._get_nested_fields(
-                validated_data, remove_fields=True
-            )
+            with nested_stage(self, STAGE_EXTRACT_NESTED, count=len(validated_data)):
+                validated_data, nested_fields_data = self._get_nested_fields(
+                    validated_data, remove_fields=True
+                )
 
-            nested_field_types = self.extract_nested_types(nested_fields_data)
+                nested_field_types = self.extract_nested_types(nested_fields_data)
 
             # Creating direct relations like ForeignKeys before we create initial instance
             for field in nested_field_types["direct_relations"]:
@@ -41,7 +50,8 @@ class CreateNestedMixin(BaseNestedMixin):
                     )
                     validated_data[field.get("original_name")] = nested_instance
 
-            model_instance = super().create(validated_data)
+            with nested_stage(self, STAGE_SAVE_INSTANCE):
+                model_instance = super().create(validated_data)
 
             # Creating reversed relations like the models that have the current model as ForeignKeys
             # using created initial instance
@@ -54,7 +64,9 @@ class CreateNestedMixin(BaseNestedMixin):
             for field in nested_field_types["generic_relations"]:
                 field_name = field.get("name")
                 field_data = field.get("data")
-                self._update_or_create_generic_relation(field_name, field_data, model_instance)
+                self._update_or_create_generic_relation(
+                    field_name, field_data, model_instance, created=True
+                )
 
             # Creating many-to-many relations using created initial instance
             for field in nested_field_types["many_to_many_fields"]:
@@ -65,12 +77,37 @@ class CreateNestedMixin(BaseNestedMixin):
             if self._errors:
                 raise ValidationError(self._errors)
         else:
-            model_instance = super().create(validated_data)
+            with nested_stage(self, STAGE_SAVE_INSTANCE):
+                model_instance = super().create(validated_data)
 
-        model_instance.refresh_from_db()
+        self._flush_unit_of_work()
+        self._refresh_instance(model_instance)
 
         return model_instance
 
+    def _create_planned_many(self, items: list) -> dict:
+        """
+        Creates the plannable items of the outermost list together, level by level:
+        all the items first, then all their nested items and so on
+        :param items: validated items of the list
+        :return: created instances mapped by the item index
+        """
+        if not self.plan_nested_writes or not self._is_nested_root:
+            return {}
+        plan, indexes = NestedWritePlanner(self).plan_each(items)
+        if plan is None:
+            return {}
+        model_instances = plan.execute()
+        self._refresh_instances(model_instances)
+        return dict(zip(indexes, model_instances))
+
+    def _should_plan_writes(self, validated_data):
+        return (
+            self.plan_nested_writes
+            and self._is_nested_root
+            and self._has_nested_fields(validated_data)
+        )
+
     def _is_field_forbidden(self, field_name):
         if hasattr(self.Meta, "forbidden_on_create") and isinstance(
             self.Meta.forbidden_on_create, list
@@ -4,15 +4,17 @@ from django.utils.translation import gettext_lazy as _
 from rest_framework.exceptions import ValidationError
 from rest_framework.fields import empty
 
-from drf_nested.mixins.base_nestable_mixin import BaseNestableMixin
+from drf_nested.mixins.bulk_write_mixin import BulkWriteMixin
 from drf_nested.utils.queryset_to_instance import nested_update, nested_validate
 
 
-class NestableMixin(BaseNestableMixin):
+class NestableMixin(BulkWriteMixin):
     write_source: Optional[str] = None
     preserve_provided: bool = False
     allow_create: bool = True
     allow_update: bool = True
+    fast_delete: bool = False
+    sync_many_to_many: bool = False
 
     def __init__(self, instance=None, data=empty, **kwargs):
         if "write_source" in kwargs:
@@ -23,6 +25,10 @@ class NestableMixin(BaseNestableMixin):
             self.allow_create = kwargs.pop("allow_create")
         if "allow_update" in kwargs:
             self.allow_update = kwargs.pop("allow_update")
+        if "fast_delete" in kwargs:
+            self.fast_delete = kwargs.pop("fast_delete")
+        if "sync_many_to_many" in kwargs:
+            self.sync_many_to_many = kwargs.pop("sync_many_to_many")
 
         super().__init__(instance, data, **kwargs)
 
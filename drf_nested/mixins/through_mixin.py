@@ -8,6 +8,7 @@ class ThroughMixin(serializers.ModelSerializer):
     connect_to_model: Optional[bool] = None
     related_name: Optional[str] = None
     should_use_related_model_pk: bool = False
+    bulk_through: bool = False
 
     def __init__(self, instance=None, data=empty, **kwargs):
         if "connect_to_model" in kwargs:
@@ -16,5 +17,7 @@ class ThroughMixin(serializers.ModelSerializer):
             self.related_name = kwargs.pop("related_name")
         if "should_use_related_model_pk" in kwargs:
             self.should_use_related_model_pk = kwargs.pop("should_use_related_model_pk")
+        if "bulk_through" in kwargs:
+            self.bulk_through = kwargs.pop("bulk_through")
 
         super().__init__(instance, data, **kwargs)
@@ -1,12 +1,15 @@
-from typing import List, Optional
+from collections import defaultdict
+from typing import Dict, List, Optional
 
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import models
+from django.db.models import Q
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 from rest_framework.fields import empty
 from rest_framework.validators import UniqueValidator
 
-from drf_nested.utils import nested_unique_validate
+from drf_nested.utils import NestedUnitOfWork, nested_unique_validate
 
 
 class UniqueFieldMixin(serializers.ModelSerializer):
@@ -15,6 +18,9 @@ class UniqueFieldMixin(serializers.ModelSerializer):
     The validators are being run on `create`/`update` instead of `is_valid`
     """
 
+    batch_unique_validation: bool = True
+    _skip_unique_validation: bool = False
+
     def __init__(self, instance=None, data=empty, **kwargs):
         self.Meta.unique_validators = []
         super().__init__(instance, data, **kwargs)
@@ -51,6 +57,7 @@ class UniqueFieldMixin(serializers.ModelSerializer):
 
     @nested_unique_validate
     def _validate_unique(self, validated_data):
+        NestedUnitOfWork.flush_pending(self, self.Meta.model)  # ty: ignore[unresolved-attribute]
         for field in self.unique_validators:
             unique_validator = UniqueValidator(self.Meta.model.objects.all())  # ty: ignore[unresolved-attribute]
             if field not in validated_data:
@@ -66,12 +73,107 @@ class UniqueFieldMixin(serializers.ModelSerializer):
             except ValidationError as exc:
                 raise ValidationError({field: exc.detail})
 
+    def _validate_unique_many(self, items: list) -> Dict[int, ValidationError]:
+        """
+        Runs unique validation for all the items of the nested list at once,
+        using a single query per unique field.
+        Duplicates inside the provided items are detected in memory, every repeated value after
+        the first one is reported. A value taken by an existing instance is reported, unless
+        an earlier item of the list moves that instance to another value.
+        :param items: validated nested items
+        :return: validation errors mapped by the item index
+        """
+        errors: Dict[int, ValidationError] = {}
+        model = self.Meta.model  # ty: ignore[unresolved-attribute]
+        NestedUnitOfWork.flush_pending(self, model)
+        pk_field = model._meta.pk
+        fields_values = []
+        for field in self.unique_validators:
+            source_attrs = self.fields[field].source_attrs
+            if len(source_attrs) > 1:
+                # Fields of the related models are validated one by one
+                return self._validate_unique_each(items)
+            model_field_name = source_attrs[0]
+            model_field = model._meta.get_field(model_field_name)
+            try:
+                indexed_values = [
+                    (index, model_field.to_python(getattr(item[field], "pk", item[field])))
+                    for index, item in enumerate(items)
+                    if isinstance(item, dict) and field in item
+                ]
+            except (DjangoValidationError, TypeError, ValueError):
+                # Values that can't be compared in the database are validated one by one
+                return self._validate_unique_each(items)
+            fields_values.append((field, model_field_name, indexed_values))
+
+        for field, model_field_name, indexed_values in fields_values:
+            if not indexed_values:
+                continue
+
+            values = set(value for _, value in indexed_values)
+            lookup = Q(**{"%s__in" % model_field_name: [v for v in values if v is not None]})
+            if None in values:
+                lookup |= Q(**{"%s__isnull" % model_field_name: True})
+            owners = defaultdict(set)
+            for pk, value in model.objects.filter(lookup).values_list(
+                pk_field.attname, model_field_name
+            ):
+                owners[value].add(pk)
+
+            # Items that update existing instances, which could release their current value
+            # for the following items of the list
+            updated_indexes = {}
+            for index, item in enumerate(items):
+                pk = item.get(pk_field.attname) if isinstance(item, dict) else None
+                if pk is not None:
+                    updated_indexes[pk_field.to_python(pk)] = index
+            values_by_index = dict(indexed_values)
+
+            seen = set()
+            for index, value in indexed_values:
+                item_pk = items[index].get(pk_field.attname)
+                item_pk = pk_field.to_python(item_pk) if item_pk is not None else None
+                conflicts = []
+                for pk in owners.get(value, ()):
+                    releasing_index = updated_indexes.get(pk)
+                    is_released = (
+                        releasing_index is not None
+                        and releasing_index < index
+                        and values_by_index.get(releasing_index, value) != value
+                    )
+                    if pk != item_pk and not is_released:
+                        conflicts.append(pk)
+                if (conflicts or value in seen) and index not in errors:
+                    errors[index] = ValidationError(
+                        {field: [UniqueValidator.message]}, code="unique"
+                    )
+                seen.add(value)
+        return errors
+
+    def _validate_unique_each(self, items: list) -> Dict[int, ValidationError]:
+        """
+        Runs unique validation for every item of the nested list separately
+        :param items: validated nested items
+        :return: validation errors mapped by the item index
+        """
+        errors: Dict[int, ValidationError] = {}
+        for index, item in enumerate(items):
+            try:
+                self._validate_unique(item)
+            except ValidationError as exc:
+                errors[index] = exc
+        return errors
+
+    def _run_unique_validation(self, validated_data):
+        if not self._skip_unique_validation:
+            self._validate_unique(validated_data)
+
     def create(self, validated_data):
-        self._validate_unique(validated_data)
+        self._run_unique_validation(validated_data)
         return super().create(validated_data)
 
     def update(self, instance, validated_data):
-        self._validate_unique(validated_data)
+        self._run_unique_validation(validated_data)
         return super().update(instance, validated_data)
 
     class Meta:
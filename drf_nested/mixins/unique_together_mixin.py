@@ -1,13 +1,15 @@
-from typing import List, Optional, Tuple
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
 
-from django.db import models
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connections, models
 from django.db.models import QuerySet
 from rest_framework.exceptions import ValidationError
 from rest_framework.fields import empty
 from rest_framework.validators import UniqueTogetherValidator
 
 from drf_nested.mixins.base_nestable_mixin import BaseNestableMixin
-from drf_nested.utils import nested_unique_validate
+from drf_nested.utils import NestedUnitOfWork, nested_unique_validate
 
 
 class UniqueTogetherMixin(BaseNestableMixin):
@@ -16,6 +18,9 @@ class UniqueTogetherMixin(BaseNestableMixin):
     The validators are being run on `create`/`update` instead of `is_valid`
     """
 
+    batch_unique_together_validation: bool = True
+    _skip_unique_together_validation: bool = False
+
     def __init__(self, instance=None, data=empty, **kwargs):
         self.Meta.unique_together_validators = []
         for validator in self.validators:
@@ -60,6 +65,7 @@ class UniqueTogetherMixin(BaseNestableMixin):
                 raise ValidationError({"non_field_errors": exc.detail})
 
     def _validate_unique_together(self, validated_data):
+        NestedUnitOfWork.flush_pending(self, self.Meta.model)  # ty: ignore[unresolved-attribute]
         # It is possible that instance set for the nested serializer is a QuerySet
         # In that case we run validation for each item on the list individually
         if isinstance(self.instance, QuerySet):
@@ -76,12 +82,180 @@ class UniqueTogetherMixin(BaseNestableMixin):
                 )
             self._validate_unique_together_instance(validated_data)
 
+    def _validate_unique_together_many(self, items: list) -> Dict[int, ValidationError]:
+        """
+        Runs unique together validation for all the items of the nested list at once,
+        using a single query per validator and chunk of values.
+        Duplicates inside the provided items are detected in memory, every repeated set of values
+        after the first one is reported. A set of values taken by an existing instance is reported,
+        unless an earlier item of the list moves that instance to other values.
+        Items that can't be checked in bulk (missing or nested values, conditional validators)
+        are validated one by one.
+        :param items: validated nested items
+        :return: validation errors mapped by the item index
+        """
+        NestedUnitOfWork.flush_pending(self, self.Meta.model)  # ty: ignore[unresolved-attribute]
+        errors: Dict[int, ValidationError] = {}
+        fallback_indexes = set()
+        for validator in self.unique_together_validators:
+            sources = self._get_unique_together_sources(validator)
+            if sources is None:
+                fallback_indexes.update(range(len(items)))
+                continue
+
+            indexed_values = []
+            for index, item in enumerate(items):
+                values = self._get_unique_together_values(item, sources)
+                if values is None:
+                    fallback_indexes.add(index)
+                elif None not in values:
+                    indexed_values.append((index, values))
+            if not indexed_values:
+                continue
+
+            owners = self._get_unique_together_owners(
+                validator, sources, set(values for _, values in indexed_values)
+            )
+            for index in self._get_unique_together_conflicts(items, indexed_values, owners):
+                if index not in errors:
+                    errors[index] = ValidationError(
+                        {
+                            "non_field_errors": [
+                                validator.message.format(field_names=", ".join(validator.fields))
+                            ]
+                        },
+                        code=validator.code,
+                    )
+
+        for index in sorted(fallback_indexes - set(errors)):
+            instance = self.instance
+            try:
+                self._validate_unique_together(items[index])
+            except ValidationError as exc:
+                errors[index] = exc
+            finally:
+                self.instance = instance
+        return errors
+
+    def _get_unique_together_sources(self, validator) -> Optional[Tuple[str, ...]]:
+        """
+        Gets the model field names checked by the validator, if it can be run in bulk
+        :param validator: unique together validator
+        :return: model field names or `None`
+        """
+        if getattr(validator, "condition", None) is not None or getattr(
+            validator, "condition_fields", None
+        ):
+            return None
+        sources = []
+        for field_name in validator.fields:
+            field = self.fields.get(field_name)
+            if field is None or len(field.source_attrs) != 1:
+                return None
+            sources.append(field.source)
+        return tuple(sources)
+
+    def _get_unique_together_values(self, item, sources: Tuple[str, ...]) -> Optional[tuple]:
+        """
+        Normalizes the item values of the validator fields to the values stored in the database
+        :param item: validated nested item
+        :param sources: model field names
+        :return: tuple of values or `None`, if the item should be validated individually
+        """
+        if not isinstance(item, dict):
+            return None
+        model = self.Meta.model  # ty: ignore[unresolved-attribute]
+        values = []
+        for source in sources:
+            if source not in item:
+                return None
+            value = item[source]
+            if isinstance(value, models.Model):
+                value = value.pk
+            elif isinstance(value, (dict, list)):
+                return None
+            try:
+                values.append(model._meta.get_field(source).to_python(value))
+            except (DjangoValidationError, TypeError, ValueError):
+                return None
+        return tuple(values)
+
+    def _get_unique_together_owners(self, validator, sources: Tuple[str, ...], values: set) -> dict:
+        """
+        Finds the existing instances, which already use the provided sets of values.
+        The values are queried in chunks, narrowed with an `__in` lookup per field
+        and matched as whole sets in memory.
+        :param validator: unique together validator
+        :param sources: model field names
+        :param values: sets of values
+        :return: primary keys of the existing instances mapped by their set of values
+        """
+        queryset = validator.queryset
+        max_query_params = connections[queryset.db].features.max_query_params
+        chunk_size = max(1, (max_query_params or 1000) // len(sources))
+        values = list(values)
+        owners = defaultdict(set)
+        pk_name = self.Meta.model._meta.pk.attname  # ty: ignore[unresolved-attribute]
+        for start in range(0, len(values), chunk_size):
+            chunk = values[start : start + chunk_size]
+            lookup = {
+                "%s__in" % source: set(value[position] for value in chunk)
+                for position, source in enumerate(sources)
+            }
+            chunk_values = set(chunk)
+            for pk, *value in queryset.filter(**lookup).values_list(pk_name, *sources):
+                if tuple(value) in chunk_values:
+                    owners[tuple(value)].add(pk)
+        return owners
+
+    def _get_unique_together_conflicts(self, items: list, indexed_values: list, owners: dict):
+        """
+        Finds the items, which set of values is already taken by an existing instance
+        or by an earlier item of the list
+        :param items: validated nested items
+        :param indexed_values: pairs of the item index and its set of values
+        :param owners: primary keys of the existing instances mapped by their set of values
+        :return: generator of the conflicting item indexes
+        """
+        pk_field = self.Meta.model._meta.pk  # ty: ignore[unresolved-attribute]
+        item_pks = {}
+        for index, item in enumerate(items):
+            pk = item.get(pk_field.attname) if isinstance(item, dict) else None
+            if pk is not None:
+                item_pks[index] = pk_field.to_python(pk)
+        # Items that update existing instances, which could release their current values
+        # for the following items of the list
+        updated_indexes = {pk: index for index, pk in item_pks.items()}
+        values_by_index = dict(indexed_values)
+
+        seen = set()
+        for index, values in indexed_values:
+            item_pk = item_pks.get(index)
+            for pk in owners.get(values, ()):
+                releasing_index = updated_indexes.get(pk)
+                is_released = (
+                    releasing_index is not None
+                    and releasing_index < index
+                    and values_by_index.get(releasing_index, values) != values
+                )
+                if pk != item_pk and not is_released:
+                    yield index
+                    break
+            else:
+                if values in seen:
+                    yield index
+            seen.add(values)
+
+    def _run_unique_together_validation(self, validated_data):
+        if not self._skip_unique_together_validation:
+            self._validate_unique_together(validated_data)
+
     def create(self, validated_data):
-        self._validate_unique_together(validated_data)
+        self._run_unique_together_validation(validated_data)
         return super().create(validated_data)
 
     def update(self, instance, validated_data):
-        self._validate_unique_together(validated_data)
+        self._run_unique_together_validation(validated_data)
         return super().update(instance, validated_data)
 
     class Meta:
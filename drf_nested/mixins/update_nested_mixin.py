@@ -1,11 +1,11 @@
-from django.db import transaction
 from rest_framework.exceptions import ValidationError
 
-from drf_nested.mixins.base_nested_mixin import BaseNestedMixin
+from drf_nested.mixins.base_nested_mixin import BaseNestedMixin, nested_atomic
+from drf_nested.utils import STAGE_EXTRACT_NESTED, STAGE_SAVE_INSTANCE, nested_stage
 
 
 class UpdateNestedMixin(BaseNestedMixin):
-    @transaction.atomic
+    @nested_atomic
     def update(self, instance, validated_data):
         """
         :param instance:
@@ -14,11 +14,12 @@ class UpdateNestedMixin(BaseNestedMixin):
         """
         self._errors = {}
         if self._has_nested_fields(validated_data):
-            validated_data, nested_fields_data = self._get_nested_fields(
-                validated_data, remove_fields=True
-            )
+            with nested_stage(self, STAGE_EXTRACT_NESTED, count=len(validated_data)):
+                validated_data, nested_fields_data = self._get_nested_fields(
+                    validated_data, remove_fields=True
+                )
 
-            nested_field_types = self.extract_nested_types(nested_fields_data)
+                nested_field_types = self.extract_nested_types(nested_fields_data)
 
             # Updating or creating direct relations like ForeignKeys before we create initial instance
             for field in nested_field_types["direct_relations"]:
@@ -32,7 +33,8 @@ class UpdateNestedMixin(BaseNestedMixin):
                 elif field_data is None:
                     validated_data[field.get("original_name")] = field_data
 
-            model_instance = super().update(instance, validated_data)
+            with nested_stage(self, STAGE_SAVE_INSTANCE):
+                model_instance = super().update(instance, validated_data)
 
             # Updating or creating reversed relations like the models that have the current model as ForeignKeys
             # using created initial instance
@@ -56,8 +58,10 @@ class UpdateNestedMixin(BaseNestedMixin):
             if self._errors:
                 raise ValidationError(self._errors)
         else:
-            model_instance = super().update(instance, validated_data)
+            with nested_stage(self, STAGE_SAVE_INSTANCE):
+                model_instance = super().update(instance, validated_data)
 
-        model_instance.refresh_from_db()
+        self._flush_unit_of_work()
+        self._refresh_instance(model_instance)
 
         return model_instance
@@ -0,0 +1,190 @@
+from django.db import router, transaction
+from django.db.models import QuerySet
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ValidationError
+from rest_framework.serializers import (
+    LIST_SERIALIZER_KWARGS,
+    LIST_SERIALIZER_KWARGS_REMOVE,
+    ListSerializer,
+    as_serializer_error,
+)
+
+from drf_nested.utils import (
+    NestedInstanceCache,
+    NestedSlowSaveRecorder,
+    NestedStatsRecorder,
+    NestedUnitOfWork,
+    dry_run_save,
+    validate_refresh_policy,
+)
+
+
+class NestedListSerializer(ListSerializer):
+    """
+    List serializer used by default for the nested and nestable serializers with `many=True`.
+    Fetches all the existing instances referenced by the list items with a single query
+    before the items are validated. The outermost list saves all the items in a single transaction:
+    the instances connected to the items by generic relations are fetched at once
+    and the bulk writes of all the items are executed together.
+    On update the items are matched with the existing instances by the primary key.
+    """
+
+    _nested_refresh_policy = None
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            self._preload_instances(data)
+        return super().to_internal_value(data)
+
+    def _preload_instances(self, data: list):
+        """
+        Puts the existing instances referenced by the list items to the instance cache
+        :param data: list of the initial nested items
+        :return: None
+        """
+        instance = getattr(self.child, "instance", None)
+        if instance is not None and not (
+            hasattr(instance, "query") and NestedInstanceCache.is_cacheable(instance)
+        ):
+            return
+        get_model_pk = getattr(self.child, "_get_model_pk", None)
+        if get_model_pk is None:
+            return
+        pk_name = get_model_pk()
+        pks = [item.get(pk_name) for item in data if isinstance(item, dict)]
+        if any(pk is not None for pk in pks):
+            NestedInstanceCache.for_serializer(self).load(self.child.Meta.model, pks)
+
+    def create(self, validated_data):
+        """
+        Creates all the items of the list. With `plan_nested_writes` on the child serializer
+        the plannable items are created together, level by level, and the rest are created one by one.
+        Errors are collected from all the items and raised together, by the item index.
+        """
+        instances = {}
+        create_planned_many = getattr(self.child, "_create_planned_many", None)
+        if create_planned_many is not None:
+            instances.update(create_planned_many(validated_data))
+        return self._save_items(validated_data, self.child.create, instances)
+
+    def update(self, instance, validated_data):
+        """
+        Updates the existing instances matched with the items by the primary key
+        and creates the items without it. Existing instances missing in the data are kept.
+        Errors are collected from all the items and raised together, by the item index.
+        """
+        pk_field = self.child.Meta.model._meta.pk
+        if isinstance(instance, QuerySet):
+            pks = [item.get(pk_field.attname) for item in validated_data]
+            instance = instance.filter(pk__in=[pk for pk in pks if pk is not None])
+        existing_instances = {
+            existing_instance.pk: existing_instance for existing_instance in instance
+        }
+
+        def save_item(attrs):
+            pk = attrs.get(pk_field.attname)
+            if pk is None:
+                return self.child.create(attrs)
+            existing_instance = existing_instances.get(pk_field.to_python(pk))
+            if existing_instance is None:
+                raise ValidationError(
+                    {
+                        pk_field.attname: [
+                            _('Invalid pk "{pk_value}" - object does not exist.').format(
+                                pk_value=pk
+                            )
+                        ]
+                    },
+                    code="does_not_exist",
+                )
+            return self.child.update(existing_instance, attrs)
+
+        return self._save_items(validated_data, save_item, {})
+
+    def _save_items(self, validated_data: list, save_item, instances: dict) -> list:
+        """
+        Saves the items of the list that are not saved yet and executes the collected writes
+        :param validated_data: validated items of the list
+        :param save_item: function saving a single item
+        :param instances: already saved instances mapped by the item index
+        :return: saved instances in the order of the items
+        """
+        errors = []
+        for index, attrs in enumerate(validated_data):
+            error = {}
+            if index not in instances:
+                try:
+                    instances[index] = save_item(attrs)
+                except ValidationError as exc:
+                    error = as_serializer_error(exc)
+            errors.append(error)
+
+        if any(errors):
+            raise ValidationError(errors)
+        self._flush_unit_of_work()
+        return [instances[index] for index in range(len(validated_data))]
+
+    def _flush_unit_of_work(self):
+        """
+        Executes the writes collected from all the items at once,
+        if the list is the outermost nested serializer
+        :return: None
+        """
+        if NestedUnitOfWork.is_owner(self):
+            NestedUnitOfWork.for_serializer(self).flush()
+
+    def save(self, **kwargs):
+        """
+        Accepts `refresh_policy` to override the refresh policy for all the items.
+        With `dry_run=True` the save is rolled back and the report of its queries is returned.
+        """
+        if kwargs.pop("dry_run", False):
+            return dry_run_save(
+                self, self.save, router.db_for_write(self.child.Meta.model), **kwargs
+            )
+        refresh_policy = kwargs.pop("refresh_policy", None)
+        if refresh_policy is not None:
+            validate_refresh_policy(refresh_policy)
+        self._nested_refresh_policy = refresh_policy
+        try:
+            using = router.db_for_write(self.child.Meta.model)
+            with NestedStatsRecorder.record(
+                self, self.child.__class__, using, len(self.validated_data)
+            ):
+                with NestedSlowSaveRecorder.record(self, self.child.__class__, using):
+                    with transaction.atomic(using=using):
+                        preload_generic_relations = getattr(
+                            self.child, "_preload_generic_relations", None
+                        )
+                        if preload_generic_relations is not None:
+                            preload_generic_relations(self.validated_data)
+                        instances = super().save(**kwargs)
+                    return instances
+        finally:
+            self._nested_refresh_policy = None
+            if self.parent is None:
+                NestedInstanceCache.clear_for(self)
+                NestedUnitOfWork.clear_for(self)
+
+
+class NestedListSerializerMixin:
+    """
+    Builds `NestedListSerializer` for the serializer initialized with `many=True`,
+    unless `list_serializer_class` is set on its `Meta`
+    """
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        if getattr(getattr(cls, "Meta", None), "list_serializer_class", None) is not None:
+            return super().many_init(*args, **kwargs)  # ty: ignore[unresolved-attribute]
+        # Same split of the arguments between the list and the child as the DRF `many_init`
+        list_kwargs = {}
+        for key in LIST_SERIALIZER_KWARGS_REMOVE:
+            value = kwargs.pop(key, None)
+            if value is not None:
+                list_kwargs[key] = value
+        list_kwargs["child"] = cls(*args, **kwargs)
+        list_kwargs.update(
+            {key: value for key, value in kwargs.items() if key in LIST_SERIALIZER_KWARGS}
+        )
+        return NestedListSerializer(*args, **list_kwargs)
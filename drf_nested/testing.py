@@ -0,0 +1,122 @@
+from typing import Callable, Iterable, Optional
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+
+def _count_queries(using: str, action: Callable) -> int:
+    with CaptureQueriesContext(connections[using]) as queries:
+        action()
+    return len(queries)
+
+
+def _get_slope(sizes: list, counts: list) -> float:
+    """
+    Fits the query count against the payload size with the least squares
+    :param sizes: payload sizes
+    :param counts: query counts
+    :return: number of the additional queries per item
+    """
+    mean_size = sum(sizes) / len(sizes)
+    mean_count = sum(counts) / len(counts)
+    variance = sum((size - mean_size) ** 2 for size in sizes)
+    covariance = sum(
+        (size - mean_size) * (count - mean_count) for size, count in zip(sizes, counts)
+    )
+    return covariance / variance
+
+
+def measure_nested_queries(
+    serializer_class,
+    payload_factory: Callable[[int], dict],
+    sizes: Iterable[int] = (1, 10, 100),
+    update_payload_factory: Optional[Callable[[int, object], dict]] = None,
+    serializer_kwargs: Optional[dict] = None,
+    using: str = DEFAULT_DB_ALIAS,
+) -> dict:
+    """
+    Counts the queries of the nested create and update (validation included) for every payload size.
+    By default the update sends back the representation of the created instance.
+    :param serializer_class: nested serializer class
+    :param payload_factory: function building the create payload of given size
+    :param sizes: payload sizes
+    :param update_payload_factory: function building the update payload of given size
+    for the created serializer
+    :param serializer_kwargs: additional serializer arguments
+    :param using: database alias
+    :return: query counts mapped by the operation and the payload size
+    """
+    serializer_kwargs = serializer_kwargs or {}
+    counts = {"create": {}, "update": {}}
+    for size in sizes:
+        serializer = serializer_class(data=payload_factory(size), **serializer_kwargs)
+
+        def create():
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+
+        counts["create"][size] = _count_queries(using, create)
+
+        if update_payload_factory is not None:
+            update_payload = update_payload_factory(size, serializer)
+        else:
+            update_payload = serializer.data
+        updated_serializer = serializer_class(
+            instance=serializer.instance, data=update_payload, **serializer_kwargs
+        )
+
+        def update():
+            updated_serializer.is_valid(raise_exception=True)
+            updated_serializer.save()
+
+        counts["update"][size] = _count_queries(using, update)
+    return counts
+
+
+def assert_nested_query_budget(
+    serializer_class,
+    payload_factory: Callable[[int], dict],
+    sizes: Iterable[int] = (1, 10, 100),
+    max_queries_per_item: float = 0,
+    operations: Iterable[str] = ("create", "update"),
+    update_payload_factory: Optional[Callable[[int, object], dict]] = None,
+    serializer_kwargs: Optional[dict] = None,
+    using: str = DEFAULT_DB_ALIAS,
+) -> dict:
+    """
+    Checks how the query count of the nested create and update grows with the payload size.
+    The count is fitted against the size and the assertion fails if every additional item
+    costs more than `max_queries_per_item` queries, i.e. the count grows linearly
+    where it should be constant.
+    :param serializer_class: nested serializer class
+    :param payload_factory: function building the create payload of given size
+    :param sizes: payload sizes, at least two different ones
+    :param max_queries_per_item: allowed number of the additional queries per item
+    :param operations: checked operations, `create` and/or `update`
+    :param update_payload_factory: function building the update payload of given size
+    for the created serializer
+    :param serializer_kwargs: additional serializer arguments
+    :param using: database alias
+    :return: query counts mapped by the operation and the payload size
+    """
+    sizes = sorted(set(sizes))
+    assert len(sizes) > 1, "At least two different payload sizes are required."
+    counts = measure_nested_queries(
+        serializer_class, payload_factory, sizes, update_payload_factory, serializer_kwargs, using
+    )
+    for operation in operations:
+        operation_counts = [counts[operation][size] for size in sizes]
+        slope = _get_slope(sizes, operation_counts)
+        # Rounding protects the constant counts from the floating point errors
+        if round(slope, 6) > max_queries_per_item:
+            raise AssertionError(
+                "%s %s costs %.2f queries per item, %s allowed. Queries by payload size: %s"
+                % (
+                    serializer_class.__name__,
+                    operation,
+                    slope,
+                    max_queries_per_item,
+                    ", ".join("%s: %s" % item for item in zip(sizes, operation_counts)),
+                )
+            )
+    return counts
@@ -1,7 +1,30 @@
+from drf_nested.utils.instance_cache import NestedInstanceCache
+from drf_nested.utils.instrumentation import (
+    STAGE_DELETE_DIFFERENCE,
+    STAGE_DIRECT_RELATIONS,
+    STAGE_EXTRACT_NESTED,
+    STAGE_GENERIC_RELATIONS,
+    STAGE_MANY_TO_MANY_FIELDS,
+    STAGE_REVERSE_RELATIONS,
+    STAGE_SAVE_INSTANCE,
+    STAGE_UNIQUE_VALIDATION,
+    NestedFieldPath,
+    NestedInstrumentation,
+    NestedStage,
+    get_instrumentations,
+    nested_field_stage,
+    nested_stage,
+)
 from drf_nested.utils.nested_exceptions import (
     NestedInstanceExceptionHandler,
     NestedListExceptionHandler,
 )
+from drf_nested.utils.query_report import (
+    NestedQueryRecorder,
+    NestedQueryReport,
+    dry_run_save,
+    get_query_operation,
+)
 from drf_nested.utils.queryset_to_instance import (
     QuerySetInstanceManager,
     nested_run_validators,
@@ -9,3 +32,36 @@ from drf_nested.utils.queryset_to_instance import (
     nested_update,
     nested_validate,
 )
+from drf_nested.utils.refresh_policy import (
+    REFRESH_ALWAYS,
+    REFRESH_DB_DEFAULTS_ONLY,
+    REFRESH_NEVER,
+    REFRESH_POLICIES,
+    REFRESH_ROOT_ONLY,
+    refresh_instance,
+    refresh_instances,
+    validate_refresh_policy,
+)
+from drf_nested.utils.relation_plan import (
+    NestedFieldSourceIndex,
+    NestedRelation,
+    NestedRelationPlan,
+    planned_lookup,
+    planned_property,
+)
+from drf_nested.utils.slow_save import (
+    NestedSlowSaveInstrumentation,
+    NestedSlowSaveRecorder,
+    get_payload_shape,
+    get_query_model,
+)
+from drf_nested.utils.stats import (
+    NestedFieldStats,
+    NestedStatsInstrumentation,
+    NestedStatsRecorder,
+    NestedStatsRegistry,
+    is_stats_enabled,
+    stats_registry,
+)
+from drf_nested.utils.tree_state import NestedTreeState
+from drf_nested.utils.unit_of_work import NestedUnitOfWork
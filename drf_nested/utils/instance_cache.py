@@ -0,0 +1,132 @@
+from typing import Iterable, Optional
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import models
+from django.db.models import QuerySet
+
+from drf_nested.utils.tree_state import NestedTreeState
+
+
+class NestedInstanceCache(NestedTreeState):
+    """
+    Existing instances of the nested tree, keyed by their model and primary key value.
+    Serves as the identity map of a single `is_valid`/`save` cycle, so every instance
+    is fetched once for the validation, the unique checks and the write.
+    Missing primary keys are remembered as well, so they are not queried again.
+    """
+
+    attribute_name = "_nested_instance_cache"
+
+    def __init__(self):
+        self.instances: dict = {}
+        self.generic_relations: dict = {}
+
+    @staticmethod
+    def is_cacheable(queryset: QuerySet) -> bool:
+        """
+        Only instances of the unfiltered querysets are shared, the filtered ones may not contain
+        the instance with requested primary key. The cache loads the instances with the default
+        manager, so the queryset should use the same database and the default manager should not
+        filter the instances either.
+        :param queryset: queryset the instance is looked up in
+        :return: if the cache can be used for the queryset
+        """
+        if queryset.query.has_filters() or queryset.query.is_sliced:
+            return False
+        default_queryset = queryset.model._default_manager.all()
+        return not default_queryset.query.has_filters() and queryset.db == default_queryset.db
+
+    @staticmethod
+    def to_pk(model: type[models.Model], pk):
+        """
+        Normalizes the primary key value, `None` is returned for invalid values
+        :param model: model class
+        :param pk: primary key value
+        :return: normalized primary key value
+        """
+        if pk is None:
+            return None
+        try:
+            return model._meta.pk.to_python(pk)  # ty: ignore[unresolved-attribute]
+        except (DjangoValidationError, TypeError, ValueError):
+            return None
+
+    def load(self, model: type[models.Model], pks: Iterable) -> dict:
+        """
+        Fetches all the instances, which are not cached yet, with a single query
+        :param model: model class
+        :param pks: primary key values
+        :return: existing instances mapped by their primary key values
+        """
+        pks = set(pk for pk in (self.to_pk(model, pk) for pk in pks) if pk is not None)
+        missing = [pk for pk in pks if (model, pk) not in self.instances]
+        if missing:
+            fetched = model._default_manager.in_bulk(missing)  # ty: ignore[unresolved-attribute]
+            for pk in missing:
+                self.instances[(model, pk)] = fetched.get(pk)
+        return {
+            pk: self.instances[(model, pk)] for pk in pks if self.instances[(model, pk)] is not None
+        }
+
+    def add(self, instances: Iterable[models.Model]) -> dict:
+        """
+        Caches the instances fetched by another query, keeping the instances that are already cached
+        :param instances: model instances
+        :return: cached instances mapped by their primary key values
+        """
+        cached = {}
+        for instance in instances:
+            key = (instance.__class__, instance.pk)
+            if self.instances.get(key) is None:
+                self.instances[key] = instance
+            cached[instance.pk] = self.instances[key]
+        return cached
+
+    def load_generic(
+        self,
+        model: type[models.Model],
+        content_type_name: str,
+        object_id_name: str,
+        content_type_pk,
+        object_ids: Iterable,
+    ) -> dict:
+        """
+        Fetches the instances connected by the generic relation to all the objects, which
+        connected instances are not cached yet, with a single query
+        :param model: model class of the connected instances
+        :param content_type_name: content type foreign key attribute name
+        :param object_id_name: object id field name
+        :param content_type_pk: content type of the objects
+        :param object_ids: primary key values of the objects
+        :return: connected instances mapped by their primary key values, mapped by the object id
+        """
+        to_object_id = model._meta.get_field(object_id_name).to_python  # ty: ignore[unresolved-attribute]
+        key = (model, content_type_name, object_id_name, content_type_pk)
+        connected = self.generic_relations.setdefault(key, {})
+        object_ids = set(
+            to_object_id(object_id) for object_id in object_ids if object_id is not None
+        )
+        missing = [object_id for object_id in object_ids if object_id not in connected]
+        if missing:
+            for object_id in missing:
+                connected[object_id] = {}
+            fetched = model._default_manager.filter(  # ty: ignore[unresolved-attribute]
+                **{content_type_name: content_type_pk, "%s__in" % object_id_name: missing}
+            )
+            for instance in self.add(fetched).values():
+                connected[getattr(instance, object_id_name)][instance.pk] = instance
+        return {object_id: connected[object_id] for object_id in object_ids}
+
+    def get(self, model: type[models.Model], pk) -> Optional[models.Model]:
+        """
+        Gets single instance, fetching it if it is not cached yet
+        :param model: model class
+        :param pk: primary key value
+        :return: model instance or `None`, if it does not exist
+        """
+        pk = self.to_pk(model, pk)
+        if pk is None:
+            return None
+        if (model, pk) not in self.instances:
+            self.load(model, [pk])
+        return self.instances[(model, pk)]
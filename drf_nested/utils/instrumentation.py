@@ -0,0 +1,178 @@
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+from typing import List, Optional
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.utils.module_loading import import_string
+
+from drf_nested.utils.tree_state import NestedTreeState
+
+STAGE_EXTRACT_NESTED = "extract_nested"
+STAGE_DIRECT_RELATIONS = "direct_relations"
+STAGE_SAVE_INSTANCE = "save_instance"
+STAGE_REVERSE_RELATIONS = "reverse_relations"
+STAGE_GENERIC_RELATIONS = "generic_relations"
+STAGE_MANY_TO_MANY_FIELDS = "many_to_many_fields"
+STAGE_DELETE_DIFFERENCE = "delete_difference"
+STAGE_UNIQUE_VALIDATION = "unique_validation"
+
+
+class NestedFieldPath(NestedTreeState):
+    """
+    Path of the nested field that is currently being saved, e.g. `groups.members`.
+    The empty path stands for the outermost serializer.
+    """
+
+    attribute_name = "_nested_field_path"
+
+    def __init__(self):
+        self.fields: list = []
+
+    def __str__(self):
+        return ".".join(self.fields)
+
+    def join(self, field_name: Optional[str]) -> str:
+        return ".".join(self.fields + [field_name]) if field_name else str(self)
+
+    @classmethod
+    @contextmanager
+    def track(cls, serializer, field_name: str):
+        """
+        Adds the nested field to the path of the serializer tree inside the block
+        :param serializer: serializer that owns the nested field
+        :param field_name: nested field name
+        :return: context manager
+        """
+        path = cls.for_serializer(serializer)
+        path.fields.append(field_name)
+        try:
+            yield path
+        finally:
+            path.fields.pop()
+
+
+class NestedStage:
+    """
+    Single stage of the nested save, passed to the instrumentation callbacks.
+    `duration` (in seconds) and `error` are set when the stage is finished.
+    """
+
+    def __init__(self, name: str, serializer_class: type, path: str, count: int):
+        self.name = name
+        self.serializer_class = serializer_class
+        self.path = path
+        self.count = count
+        self.started_at = perf_counter()
+        self.duration: Optional[float] = None
+        self.error: Optional[BaseException] = None
+
+    def __repr__(self):
+        return "<%s %s %s (%s)>" % (self.__class__.__name__, self.name, self.path, self.count)
+
+
+class NestedInstrumentation:
+    """
+    Base class of the instrumentation registered in the `INSTRUMENTATION` list
+    of the `DRF_NESTED` setting, e.g.:
+
+    DRF_NESTED = {"INSTRUMENTATION": ["myproject.tracing.NestedTracing"]}
+
+    Every registered class is instantiated once and gets the callbacks of all the nested stages.
+    """
+
+    def stage_started(self, stage: NestedStage):
+        pass
+
+    def stage_finished(self, stage: NestedStage):
+        pass
+
+
+_instrumentations: Optional[List[NestedInstrumentation]] = None
+
+
+def get_instrumentations() -> List[NestedInstrumentation]:
+    """
+    Gets the instances of the registered instrumentation classes,
+    including the stats and the slow save instrumentations, if they are enabled
+    :return: list of instrumentations
+    """
+    global _instrumentations
+    if _instrumentations is None:
+        nested_settings = getattr(settings, "DRF_NESTED", {})
+        paths = list(nested_settings.get("INSTRUMENTATION", []))
+        if nested_settings.get("STATS", False):
+            paths.append("drf_nested.utils.stats.NestedStatsInstrumentation")
+        if nested_settings.get("SLOW_SAVE"):
+            paths.append("drf_nested.utils.slow_save.NestedSlowSaveInstrumentation")
+        _instrumentations = [import_string(path)() for path in paths]
+    return _instrumentations
+
+
+def reset_instrumentations(setting=None, **kwargs):
+    global _instrumentations
+    if setting in (None, "DRF_NESTED"):
+        _instrumentations = None
+
+
+setting_changed.connect(reset_instrumentations)
+
+
+@contextmanager
+def nested_stage(serializer, name: str, field_name: Optional[str] = None, count: int = 1):
+    """
+    Reports the start and the end of the nested stage to the registered instrumentations
+    :param serializer: serializer running the stage
+    :param name: stage name
+    :param field_name: nested field name, if the stage is run for the nested field
+    :param count: number of the processed items
+    :return: context manager, providing the stage or `None`, if no instrumentation is registered
+    """
+    instrumentations = get_instrumentations()
+    if not instrumentations:
+        yield None
+        return
+
+    stage = NestedStage(
+        name,
+        serializer.__class__,
+        NestedFieldPath.for_serializer(serializer).join(field_name),
+        count,
+    )
+    for instrumentation in instrumentations:
+        instrumentation.stage_started(stage)
+    try:
+        yield stage
+    except BaseException as exc:
+        stage.error = exc
+        raise
+    finally:
+        stage.duration = perf_counter() - stage.started_at
+        for instrumentation in reversed(instrumentations):
+            instrumentation.stage_finished(stage)
+
+
+def get_item_count(data) -> int:
+    if isinstance(data, list):
+        return len(data)
+    return 0 if data is None else 1
+
+
+def nested_field_stage(name: str):
+    """
+    Runs the method as the stage of its nested field, the first argument of the method,
+    and adds the field to the nested path
+    :param name: stage name
+    """
+
+    def decorator(method):
+        @wraps(method)
+        def wrapped(self, field_name, data, *args, **kwargs):
+            with nested_stage(self, name, field_name, get_item_count(data)):
+                with NestedFieldPath.track(self, field_name):
+                    return method(self, field_name, data, *args, **kwargs)
+
+        return wrapped
+
+    return decorator
@@ -0,0 +1,138 @@
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Optional
+
+from django.db import connections, models, transaction
+
+from drf_nested.utils.instrumentation import NestedFieldPath
+from drf_nested.utils.tree_state import NestedTreeState
+
+QUERY_OPERATIONS = ("select", "insert", "update", "delete")
+
+
+def get_query_operation(sql: str) -> str:
+    """
+    Gets the type of the query operation, `other` for the transaction management and the rest
+    :param sql: query SQL
+    :return: operation type
+    """
+    words = sql.split(None, 1)
+    operation = words[0].lower() if words else ""
+    return operation if operation in QUERY_OPERATIONS else "other"
+
+
+class NestedQueryReport:
+    """
+    Queries issued by the nested save, grouped by the nested field path and the operation type.
+    The empty path stands for the outermost serializer, nested fields are joined with dots.
+    """
+
+    def __init__(self):
+        self.queries: list = []
+        self.fields: dict = {}
+
+    def add(self, path: str, sql: str, duration: float):
+        operation = get_query_operation(sql)
+        self.queries.append({"path": path, "operation": operation, "sql": sql, "time": duration})
+        stats = self.fields.setdefault(path, {}).setdefault(operation, {"count": 0, "time": 0.0})
+        stats["count"] += 1
+        stats["time"] += duration
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def time(self) -> float:
+        return sum(query["time"] for query in self.queries)
+
+    def get_count(self, path: str = None, operation: str = None) -> int:
+        """
+        Counts the queries of the nested field path and/or the operation type
+        :param path: nested field path
+        :param operation: operation type
+        :return: number of queries
+        """
+        return sum(
+            1
+            for query in self.queries
+            if (path is None or query["path"] == path)
+            and (operation is None or query["operation"] == operation)
+        )
+
+    def as_dict(self) -> dict:
+        return {"count": self.count, "time": self.time, "fields": self.fields}
+
+    def __repr__(self):
+        return "<%s %s queries>" % (self.__class__.__name__, self.count)
+
+
+class NestedQueryRecorder(NestedTreeState):
+    """
+    Database execute wrapper, recording the queries of the nested tree together with
+    the path of the nested field they are issued for
+    """
+
+    attribute_name = "_nested_query_recorder"
+
+    def __init__(self):
+        self.report = NestedQueryReport()
+        self.path: Optional[NestedFieldPath] = None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.report.add(str(self.path or ""), sql, perf_counter() - start)
+
+    @classmethod
+    @contextmanager
+    def record(cls, serializer, using: str):
+        """
+        Records all the queries of the nested tree issued inside the block
+        :param serializer: outermost serializer
+        :param using: database alias
+        :return: context manager, providing the recorder
+        """
+        recorder = cls.for_serializer(serializer)
+        recorder.path = NestedFieldPath.for_serializer(serializer)
+        try:
+            with connections[using].execute_wrapper(recorder):
+                yield recorder
+        finally:
+            cls.clear_for(serializer)
+
+
+def dry_run_save(serializer, save, using: str, **kwargs) -> NestedQueryReport:
+    """
+    Runs the serializer save inside the transaction that is always rolled back
+    :param serializer: outermost serializer
+    :param save: save method to run
+    :param using: database alias
+    :param kwargs: save arguments
+    :return: report of the queries the save has issued
+    """
+    instance = serializer.instance
+    try:
+        with transaction.atomic(using=using):
+            with NestedQueryRecorder.record(serializer, using) as recorder:
+                save(**kwargs)
+            transaction.set_rollback(True, using=using)
+    finally:
+        # The saved instance doesn't exist in the database anymore
+        serializer.instance = instance
+        # and the updated instance has to drop the values that were rolled back
+        _refresh_rolled_back(instance, using)
+    return recorder.report
+
+
+def _refresh_rolled_back(instance, using: str):
+    if isinstance(instance, models.Model):
+        instance.refresh_from_db(using=using)
+    elif isinstance(instance, (list, tuple)):
+        for item in instance:
+            _refresh_rolled_back(item, using)
+    elif isinstance(instance, models.QuerySet) and instance._result_cache is not None:
+        for item in instance._result_cache:
+            _refresh_rolled_back(item, using)
@@ -0,0 +1,106 @@
+from django.db.models import NOT_PROVIDED
+
+REFRESH_ALWAYS = "always"
+REFRESH_ROOT_ONLY = "root_only"
+REFRESH_DB_DEFAULTS_ONLY = "db_defaults_only"
+REFRESH_NEVER = "never"
+
+REFRESH_POLICIES = (
+    REFRESH_ALWAYS,
+    REFRESH_ROOT_ONLY,
+    REFRESH_DB_DEFAULTS_ONLY,
+    REFRESH_NEVER,
+)
+
+
+def validate_refresh_policy(policy: str):
+    assert policy in REFRESH_POLICIES, "Unknown refresh policy `%s`, expected one of: %s" % (
+        policy,
+        ", ".join(REFRESH_POLICIES),
+    )
+
+
+def get_db_default_fields(instance) -> list:
+    """
+    Gets the fields which values are set by the database on save:
+    the fields with database defaults and the fields that were assigned an expression
+    :param instance: model instance
+    :return: list of field attnames
+    """
+    return [
+        field.attname
+        for field in instance._meta.concrete_fields
+        if getattr(field, "db_default", NOT_PROVIDED) is not NOT_PROVIDED
+        or hasattr(instance.__dict__.get(field.attname), "resolve_expression")
+    ]
+
+
+def refresh_instance(instance, policy: str, is_root: bool):
+    """
+    Reloads saved instance from the database according to the refresh policy
+    :param instance: saved model instance
+    :param policy: one of the `REFRESH_POLICIES`
+    :param is_root: indicator whether the instance is saved by the outermost nested serializer
+    :return: None
+    """
+    validate_refresh_policy(policy)
+    if policy == REFRESH_ALWAYS or (policy == REFRESH_ROOT_ONLY and is_root):
+        instance.refresh_from_db()
+    elif policy == REFRESH_DB_DEFAULTS_ONLY:
+        fields = get_db_default_fields(instance)
+        if fields:
+            instance.refresh_from_db(fields=fields)
+
+
+def refresh_instances(instances: list, policy: str, is_root: bool):
+    """
+    Reloads saved instances of the same model from the database according to the refresh policy,
+    with a single query for all of them
+    :param instances: saved model instances
+    :param policy: one of the `REFRESH_POLICIES`
+    :param is_root: indicator whether the instances are saved by the outermost nested serializer
+    :return: None
+    """
+    validate_refresh_policy(policy)
+    if not instances:
+        return
+    if policy == REFRESH_ALWAYS or (policy == REFRESH_ROOT_ONLY and is_root):
+        fields = None
+    elif policy == REFRESH_DB_DEFAULTS_ONLY:
+        fields = {field for instance in instances for field in get_db_default_fields(instance)}
+        if not fields:
+            return
+    else:
+        return
+
+    model = instances[0].__class__
+    queryset = model._base_manager.db_manager(instances[0]._state.db)
+    if fields is not None:
+        queryset = queryset.only(*fields)
+    db_instances = queryset.in_bulk([instance.pk for instance in instances])
+    for instance in instances:
+        db_instance = db_instances.get(instance.pk)
+        if db_instance is None:
+            raise model.DoesNotExist("%s matching query does not exist." % model._meta.object_name)
+        _copy_db_values(instance, db_instance, fields)
+
+
+def _copy_db_values(instance, db_instance, fields=None):
+    """
+    Sets the loaded values to the instance and clears its cached relations like `refresh_from_db()`
+    """
+    for field in instance._meta.concrete_fields:
+        if fields is not None and field.attname not in fields:
+            continue
+        setattr(instance, field.attname, getattr(db_instance, field.attname))
+        if field.is_relation and field.is_cached(instance):
+            field.delete_cached_value(instance)
+    if fields is None:
+        instance.__dict__.pop("_prefetched_objects_cache", None)
+        for field in instance._meta.related_objects:
+            if field.is_cached(instance):
+                field.delete_cached_value(instance)
+        for field in instance._meta.private_fields:
+            if field.is_relation and field.is_cached(instance):
+                field.delete_cached_value(instance)
+    instance._state.db = db_instance._state.db
@@ -0,0 +1,154 @@
+from functools import wraps
+from typing import Optional, Tuple
+
+_missing = object()
+
+
+class NestedRelation:
+    """
+    Describes how the nested serializer field is connected to the serializer model
+    """
+
+    def __init__(
+        self,
+        field_name: str,
+        model_field_name: str,
+        kinds: Tuple[str, ...],
+        pk_name: Optional[str],
+        related_name: Optional[str],
+        serializer_class: Optional[type],
+        read_only: bool,
+    ):
+        self.field_name = field_name
+        self.model_field_name = model_field_name
+        self.kinds = kinds
+        self.pk_name = pk_name
+        self.related_name = related_name
+        self.serializer_class = serializer_class
+        self.read_only = read_only
+
+    def __repr__(self):
+        return "<%s %s -> %s (%s)>" % (
+            self.__class__.__name__,
+            self.field_name,
+            self.model_field_name,
+            ", ".join(self.kinds),
+        )
+
+
+class NestedFieldSourceIndex:
+    """
+    Bidirectional index of the serializer field names, their sources and write sources
+    """
+
+    def __init__(self):
+        self.field_names: set = set()
+        self.sources: dict = {}
+        self.write_sources: dict = {}
+        self.source_to_field_name: dict = {}
+
+    def add(self, field_name: str, source: Optional[str], write_source: Optional[str]):
+        """
+        Adds serializer field to the index. The first added field wins for a repeated source.
+        :param field_name: serializer field name
+        :param source: field source
+        :param write_source: field write source, if provided
+        """
+        self.field_names.add(field_name)
+        self.sources[field_name] = source
+        if source is not None:
+            self.source_to_field_name.setdefault(source, field_name)
+        if write_source is not None:
+            self.write_sources[field_name] = write_source
+            self.source_to_field_name.setdefault(write_source, field_name)
+
+
+class NestedRelationPlan:
+    """
+    Relations of the serializer class, compiled once and shared by all the serializer instances
+    with the same set of fields.
+    Contains only names and classes, so it is safe to keep it on the serializer class.
+    """
+
+    def __init__(self, key: tuple):
+        self.key = key
+        self.values: dict = {}
+        self.lookups: dict = {}
+
+    @classmethod
+    def for_serializer(cls, serializer) -> "NestedRelationPlan":
+        """
+        Gets the plan for the serializer instance, compiling it on the first use for its fields
+        :param serializer: serializer instance
+        :return: relation plan
+        """
+        serializer_class = serializer.__class__
+        plans = serializer_class.__dict__.get("_nested_relation_plans")
+        if plans is None:
+            plans = {}
+            setattr(serializer_class, "_nested_relation_plans", plans)
+
+        key = cls.get_key(serializer)
+        plan = plans.get(key)
+        if plan is None:
+            plan = plans[key] = cls(key)
+        return plan
+
+    @staticmethod
+    def get_key(serializer) -> tuple:
+        """
+        Builds the key that identifies the set of the serializer fields the plan is compiled for
+        :param serializer: serializer instance
+        :return: fields signature
+        """
+        key = []
+        for field_name, field in serializer.fields.items():
+            child = getattr(field, "child", None)
+            key.append(
+                (
+                    field_name,
+                    field.__class__,
+                    field.source,
+                    field.read_only,
+                    child.__class__,
+                    getattr(child, "source", None),
+                    getattr(child, "write_source", None),
+                    getattr(field, "write_source", None),
+                    getattr(field, "child_relation", None).__class__,
+                )
+            )
+        return tuple(key)
+
+
+def planned_property(method):
+    """
+    Read-only property, which value is computed once and stored in the serializer relation plan
+    """
+    name = method.__name__
+
+    @wraps(method)
+    def getter(self):
+        values = self._relation_plan.values
+        value = values.get(name, _missing)
+        if value is _missing:
+            value = values[name] = method(self)
+        return value
+
+    return property(getter)
+
+
+def planned_lookup(method):
+    """
+    Single argument method, which results are computed once and stored in the serializer relation plan
+    """
+    name = method.__name__
+
+    @wraps(method)
+    def wrapped(self, argument):
+        lookups = self._relation_plan.lookups
+        value = lookups.get((name, argument), _missing)
+        if value is _missing:
+            value = lookups[(name, argument)] = method(self, argument)
+        return value
+
+    return wrapped
@@ -0,0 +1,198 @@
+import logging
+import re
+from collections.abc import Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from time import perf_counter
+from typing import Optional
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connections
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+from drf_nested.utils.instrumentation import NestedInstrumentation, NestedStage
+from drf_nested.utils.tree_state import NestedTreeState
+
+logger = logging.getLogger("drf_nested.slow_save")
+
+TABLE_RE = re.compile(r'\b(?:FROM|INTO|UPDATE)\s+[`"\[]?([\w.]+)', re.IGNORECASE)
+
+_active_recorder: ContextVar[Optional["NestedSlowSaveRecorder"]] = ContextVar(
+    "drf_nested_slow_save_recorder", default=None
+)
+
+
+def get_slow_save_thresholds() -> Optional[dict]:
+    """
+    Gets the thresholds of the `SLOW_SAVE` key of the `DRF_NESTED` setting, e.g.:
+
+    DRF_NESTED = {"SLOW_SAVE": {"TIME": 500, "QUERIES": 200}}
+
+    :return: maximal time in milliseconds and query count or `None`, if the logging is disabled
+    """
+    return getattr(settings, "DRF_NESTED", {}).get("SLOW_SAVE")
+
+
+@lru_cache(maxsize=None)
+def _get_table_models() -> dict:
+    return {
+        model._meta.db_table: model._meta.label
+        for model in apps.get_models(include_auto_created=True)
+    }
+
+
+def get_query_model(sql: str) -> str:
+    """
+    Gets the label of the model the query is issued for, by its first table
+    :param sql: query SQL
+    :return: model label, the table name for the unknown tables or `other` for the rest
+    """
+    match = TABLE_RE.search(sql)
+    if match is None:
+        return "other"
+    table = match.group(1)
+    return _get_table_models().get(table, table)
+
+
+def get_payload_shape(serializer, data) -> dict:
+    """
+    Describes the nested fields of the payload without their values.
+    For every nested field path it gives its nesting `depth`, the total number of the nested `items`
+    and the `max_length` of the nested list.
+    :param serializer: serializer the payload is sent to
+    :param data: payload
+    :return: shapes mapped by the nested field path
+    """
+    shape = {}
+    _add_payload_shape(shape, serializer, data, "", 1)
+    return shape
+
+
+def _add_payload_shape(shape: dict, serializer, data, prefix: str, depth: int):
+    if isinstance(serializer, ListSerializer):
+        serializer = serializer.child
+    if not hasattr(serializer, "fields"):
+        return
+    for item in data if isinstance(data, list) else [data]:
+        if not isinstance(item, Mapping):
+            continue
+        for field_name, field in serializer.fields.items():
+            if not isinstance(field, BaseSerializer) or field.read_only or field_name not in item:
+                continue
+            value = item[field_name]
+            path = prefix + field_name
+            field_shape = shape.setdefault(path, {"depth": depth, "items": 0, "max_length": 0})
+            length = len(value) if isinstance(value, list) else int(value is not None)
+            field_shape["items"] += length
+            field_shape["max_length"] = max(field_shape["max_length"], length)
+            _add_payload_shape(shape, field, value, path + ".", depth + 1)
+
+
+class NestedSlowSaveRecorder(NestedTreeState):
+    """
+    Query count by model and time by stage of a single save of the nested tree,
+    logged by the `drf_nested.slow_save` logger when the save exceeds the configured thresholds.
+    The time of the stage is exclusive: the time of the stages nested into it is not included.
+    """
+
+    attribute_name = "_nested_slow_save_recorder"
+
+    def __init__(self):
+        self.queries: dict = {}
+        self.stages: dict = {}
+        # Time of the finished nested stages of every running stage
+        self._nested_time: list = []
+
+    def __call__(self, execute, sql, params, many, context):
+        model = get_query_model(sql)
+        self.queries[model] = self.queries.get(model, 0) + 1
+        return execute(sql, params, many, context)
+
+    def start_stage(self, stage: NestedStage):
+        self._nested_time.append(0.0)
+
+    def add_stage(self, stage: NestedStage):
+        duration = stage.duration or 0.0
+        nested_time = self._nested_time.pop() if self._nested_time else 0.0
+        self.stages[stage.name] = self.stages.get(stage.name, 0.0) + duration - nested_time
+        if self._nested_time:
+            self._nested_time[-1] += duration
+
+    @classmethod
+    @contextmanager
+    def record(cls, serializer, serializer_class: type, using: str):
+        """
+        Logs the save of the nested tree, if it exceeds the thresholds
+        :param serializer: outermost serializer
+        :param serializer_class: class the save is logged for
+        :param using: database alias
+        :return: context manager, providing the recorder or `None`, if the logging is disabled
+        """
+        thresholds = get_slow_save_thresholds()
+        if not thresholds or _active_recorder.get() is not None:
+            yield None
+            return
+
+        operation = "create" if serializer.instance is None else "update"
+        recorder = cls.for_serializer(serializer)
+        token = _active_recorder.set(recorder)
+        error = None
+        start = perf_counter()
+        try:
+            with connections[using].execute_wrapper(recorder):
+                yield recorder
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            duration = (perf_counter() - start) * 1000
+            _active_recorder.reset(token)
+            cls.clear_for(serializer)
+            query_count = sum(recorder.queries.values())
+            max_time = thresholds.get("TIME")
+            max_queries = thresholds.get("QUERIES")
+            if (max_time is not None and duration > max_time) or (
+                max_queries is not None and query_count > max_queries
+            ):
+                recorder.log(serializer, serializer_class, operation, duration, error)
+
+    def log(self, serializer, serializer_class: type, operation: str, duration: float, error=None):
+        data = getattr(serializer, "initial_data", None)
+        record = {
+            "serializer": "%s.%s" % (serializer_class.__module__, serializer_class.__qualname__),
+            "operation": operation,
+            "items": len(data) if isinstance(data, list) else 1,
+            "time": duration,
+            "queries": sum(self.queries.values()),
+            "queries_by_model": dict(self.queries),
+            "stages": {name: value * 1000 for name, value in self.stages.items()},
+            "shape": get_payload_shape(serializer, data),
+            "error": error.__class__.__name__ if error is not None else None,
+        }
+        logger.warning(
+            "Slow nested %s of %s: %.1f ms, %s queries",
+            operation,
+            serializer_class.__name__,
+            duration,
+            record["queries"],
+            extra={"nested_save": record},
+        )
+
+
+class NestedSlowSaveInstrumentation(NestedInstrumentation):
+    """
+    Adds the stage durations to the running slow save recorder.
+    Registered automatically when the slow save logging is enabled.
+    """
+
+    def stage_started(self, stage: NestedStage):
+        recorder = _active_recorder.get()
+        if recorder is not None:
+            recorder.start_stage(stage)
+
+    def stage_finished(self, stage: NestedStage):
+        recorder = _active_recorder.get()
+        if recorder is not None:
+            recorder.add_stage(stage)
@@ -0,0 +1,325 @@
+import json
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Optional
+
+from django.conf import settings
+from django.db import connections
+
+from drf_nested.utils.instrumentation import (
+    STAGE_DIRECT_RELATIONS,
+    STAGE_GENERIC_RELATIONS,
+    STAGE_MANY_TO_MANY_FIELDS,
+    STAGE_REVERSE_RELATIONS,
+    NestedFieldPath,
+    NestedInstrumentation,
+    NestedStage,
+)
+from drf_nested.utils.query_report import get_query_operation
+from drf_nested.utils.tree_state import NestedTreeState
+
+FIELD_STAGES = (
+    STAGE_DIRECT_RELATIONS,
+    STAGE_REVERSE_RELATIONS,
+    STAGE_GENERIC_RELATIONS,
+    STAGE_MANY_TO_MANY_FIELDS,
+)
+
+STATS_COUNTERS = ("calls", "items", "queries", "created", "updated", "deleted", "time")
+
+PROMETHEUS_METRICS = (
+    ("calls", "drf_nested_calls_total", "Saves of the nested serializer or field"),
+    ("items", "drf_nested_items_total", "Items processed by the nested serializer or field"),
+    ("queries", "drf_nested_queries_total", "Queries issued for the nested serializer or field"),
+    (
+        "created",
+        "drf_nested_rows_created_total",
+        "Rows inserted for the nested serializer or field",
+    ),
+    ("updated", "drf_nested_rows_updated_total", "Rows updated for the nested serializer or field"),
+    ("deleted", "drf_nested_rows_deleted_total", "Rows deleted for the nested serializer or field"),
+    ("time", "drf_nested_seconds_total", "Time spent saving the nested serializer or field"),
+)
+
+_active_recorder: ContextVar[Optional["NestedStatsRecorder"]] = ContextVar(
+    "drf_nested_stats_recorder", default=None
+)
+
+
+def is_stats_enabled() -> bool:
+    return bool(getattr(settings, "DRF_NESTED", {}).get("STATS", False))
+
+
+def get_serializer_label(serializer_class: type) -> str:
+    return "%s.%s" % (serializer_class.__module__, serializer_class.__qualname__)
+
+
+def get_row_count(operation: str, sql: str, params, many: bool, cursor) -> int:
+    """
+    Gets the number of rows written by the query, as reported by the cursor.
+    Some backends, e.g. SQLite, report the rows inserted with `RETURNING` only after they are fetched:
+    such an insert is counted by the number of its parameter sets, the bulk inserts are counted
+    by the written instances in `NestedStatsRecorder.record_bulk_write`.
+    :param operation: query operation type
+    :param sql: query SQL
+    :param params: query parameters
+    :param many: if the query is executed for the list of parameters
+    :param cursor: executed cursor
+    :return: number of the inserted, updated or deleted rows
+    """
+    if operation not in ("insert", "update", "delete"):
+        return 0
+    rowcount = getattr(cursor, "rowcount", -1)
+    if rowcount > 0 or operation != "insert" or " RETURNING " not in sql:
+        return max(rowcount, 0)
+    return len(params) if many else 1
+
+
+class NestedFieldStats:
+    """
+    Cumulative counters of the nested serializer (the empty field path) or of its nested field.
+    `time` is inclusive: the time of the field includes the time of the fields nested into it.
+    """
+
+    def __init__(self, serializer: str, path: str):
+        self.serializer = serializer
+        self.path = path
+        self.calls = 0
+        self.items = 0
+        self.queries = 0
+        self.created = 0
+        self.updated = 0
+        self.deleted = 0
+        self.time = 0.0
+
+    def merge(self, other: "NestedFieldStats"):
+        for counter in STATS_COUNTERS:
+            setattr(self, counter, getattr(self, counter) + getattr(other, counter))
+
+    def as_dict(self) -> dict:
+        data = {"serializer": self.serializer, "path": self.path}
+        data.update((counter, getattr(self, counter)) for counter in STATS_COUNTERS)
+        return data
+
+    def __repr__(self):
+        return "<%s %s %s (%s calls)>" % (
+            self.__class__.__name__,
+            self.serializer,
+            self.path,
+            self.calls,
+        )
+
+
+class NestedStatsRegistry:
+    """
+    In-process registry of the cumulative nested save counters,
+    keyed by the outermost serializer class and the nested field path
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: dict = {}
+
+    def merge(self, stats: list):
+        """
+        Adds the counters of a single save to the registry
+        :param stats: list of `NestedFieldStats`
+        :return: None
+        """
+        with self._lock:
+            for field_stats in stats:
+                key = (field_stats.serializer, field_stats.path)
+                if key not in self._stats:
+                    self._stats[key] = NestedFieldStats(*key)
+                self._stats[key].merge(field_stats)
+
+    def load(self, data: list):
+        """
+        Adds the counters exported with `as_list()` or `to_json()`, e.g. by another process
+        :param data: list of the exported counters
+        :return: None
+        """
+        stats = []
+        for item in data:
+            field_stats = NestedFieldStats(item["serializer"], item["path"])
+            for counter in STATS_COUNTERS:
+                setattr(field_stats, counter, item.get(counter, 0))
+            stats.append(field_stats)
+        self.merge(stats)
+
+    def get(self, serializer, path: str = "") -> Optional[NestedFieldStats]:
+        """
+        Gets the counters of the serializer or its nested field
+        :param serializer: serializer class or its dotted path
+        :param path: nested field path, the empty one for the serializer itself
+        :return: counters or `None`, if nothing was saved yet
+        """
+        if isinstance(serializer, type):
+            serializer = get_serializer_label(serializer)
+        return self._stats.get((serializer, path))
+
+    def reset(self):
+        with self._lock:
+            self._stats = {}
+
+    def as_list(self) -> list:
+        with self._lock:
+            stats = sorted(self._stats.values(), key=lambda item: (item.serializer, item.path))
+            return [field_stats.as_dict() for field_stats in stats]
+
+    def to_json(self, indent: Optional[int] = None) -> str:
+        return json.dumps(self.as_list(), indent=indent)
+
+    def to_prometheus(self) -> str:
+        """
+        Renders the counters in the Prometheus text exposition format
+        :return: metrics text
+        """
+        stats = self.as_list()
+        lines = []
+        for counter, metric, description in PROMETHEUS_METRICS:
+            lines.append("# HELP %s %s" % (metric, description))
+            lines.append("# TYPE %s counter" % metric)
+            for item in stats:
+                lines.append(
+                    '%s{serializer="%s",path="%s"} %s'
+                    % (
+                        metric,
+                        _escape_label(item["serializer"]),
+                        _escape_label(item["path"]),
+                        item[counter],
+                    )
+                )
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+stats_registry = NestedStatsRegistry()
+
+
+class NestedStatsRecorder(NestedTreeState):
+    """
+    Counters of a single save of the nested tree, added to the registry when the save is finished.
+    Queries and written rows are counted by the database execute wrapper,
+    calls, items and time of the nested fields - by the nested stages.
+    """
+
+    attribute_name = "_nested_stats_recorder"
+
+    def __init__(self):
+        self.serializer = ""
+        self.path: Optional[NestedFieldPath] = None
+        self.bulk_write_path: Optional[str] = None
+        self.fields: dict = {}
+
+    def get_field_stats(self, path: str) -> NestedFieldStats:
+        field_stats = self.fields.get(path)
+        if field_stats is None:
+            field_stats = self.fields[path] = NestedFieldStats(self.serializer, path)
+        return field_stats
+
+    def add_stage(self, stage: NestedStage):
+        field_stats = self.get_field_stats(stage.path)
+        field_stats.calls += 1
+        field_stats.items += stage.count
+        field_stats.time += stage.duration or 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        result = execute(sql, params, many, context)
+        operation = get_query_operation(sql)
+        bulk_write_path = self.bulk_write_path
+        field_stats = self.get_field_stats(
+            str(self.path or "") if bulk_write_path is None else bulk_write_path
+        )
+        field_stats.queries += 1
+        if bulk_write_path is not None and operation in ("insert", "update"):
+            # Rows of the bulk write are counted by its instances
+            return result
+        rows = get_row_count(operation, sql, params, many, context.get("cursor"))
+        if operation == "insert":
+            field_stats.created += rows
+        elif operation == "update":
+            field_stats.updated += rows
+        elif operation == "delete":
+            field_stats.deleted += rows
+        return result
+
+    @classmethod
+    @contextmanager
+    def record_bulk_write(cls, operation: str, paths: list):
+        """
+        Attributes the bulk write of the instances to the nested fields they were collected by:
+        the queries to the field of the first instance and the rows to the field of every instance.
+        The rows are counted by the written instances, as not every backend reports them.
+        :param operation: query operation type, "insert" or "update"
+        :param paths: nested field path of every written instance, `None` for the current path
+        :return: context manager
+        """
+        recorder = _active_recorder.get()
+        if recorder is None or not paths:
+            yield
+            return
+
+        current_path = str(recorder.path or "")
+        paths = [current_path if path is None else path for path in paths]
+        previous_path, recorder.bulk_write_path = recorder.bulk_write_path, paths[0]
+        try:
+            yield
+        finally:
+            recorder.bulk_write_path = previous_path
+        for path in paths:
+            field_stats = recorder.get_field_stats(path)
+            if operation == "insert":
+                field_stats.created += 1
+            else:
+                field_stats.updated += 1
+
+    @classmethod
+    @contextmanager
+    def record(cls, serializer, serializer_class: type, using: str, count: int = 1):
+        """
+        Counts the save of the nested tree, if the stats are enabled with the `STATS` key
+        of the `DRF_NESTED` setting
+        :param serializer: outermost serializer
+        :param serializer_class: class the counters are registered for
+        :param using: database alias
+        :param count: number of the saved items
+        :return: context manager, providing the recorder or `None`, if the stats are disabled
+        """
+        if not is_stats_enabled() or _active_recorder.get() is not None:
+            yield None
+            return
+
+        recorder = cls.for_serializer(serializer)
+        recorder.serializer = get_serializer_label(serializer_class)
+        recorder.path = NestedFieldPath.for_serializer(serializer)
+        token = _active_recorder.set(recorder)
+        start = perf_counter()
+        try:
+            with connections[using].execute_wrapper(recorder):
+                yield recorder
+        finally:
+            _active_recorder.reset(token)
+            root_stats = recorder.get_field_stats("")
+            root_stats.calls += 1
+            root_stats.items += count
+            root_stats.time += perf_counter() - start
+            stats_registry.merge(list(recorder.fields.values()))
+            cls.clear_for(serializer)
+
+
+class NestedStatsInstrumentation(NestedInstrumentation):
+    """
+    Adds the stages of the nested fields to the stats of the running save.
+    Registered automatically when the stats are enabled.
+    """
+
+    def stage_finished(self, stage: NestedStage):
+        recorder = _active_recorder.get()
+        if recorder is not None and stage.name in FIELD_STAGES:
+            recorder.add_stage(stage)
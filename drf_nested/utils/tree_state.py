@@ -0,0 +1,30 @@
+class NestedTreeState:
+    """
+    State shared by all the serializers of a nested tree.
+    It is stored on the outermost serializer and lives until its `save()` is finished.
+    """
+
+    attribute_name: str
+
+    @classmethod
+    def for_serializer(cls, serializer):
+        """
+        Gets the state of the serializer tree, creating it on the first use
+        :param serializer: any serializer of the tree
+        :return: state instance
+        """
+        root = serializer.root
+        state = root.__dict__.get(cls.attribute_name)
+        if state is None:
+            state = cls()
+            setattr(root, cls.attribute_name, state)
+        return state
+
+    @classmethod
+    def clear_for(cls, serializer):
+        """
+        Drops the state of the serializer tree
+        :param serializer: any serializer of the tree
+        :return: None
+        """
+        serializer.root.__dict__.pop(cls.attribute_name, None)
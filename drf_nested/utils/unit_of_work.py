@@ -0,0 +1,129 @@
+from typing import Iterable, Optional
+
+from django.db import models
+
+from drf_nested.utils.stats import NestedStatsRecorder
+from drf_nested.utils.tree_state import NestedTreeState
+
+
+class NestedUnitOfWork(NestedTreeState):
+    """
+    Writes collected from every serializer of the nested tree during a single `save()`.
+    They are flushed once by the outermost nested serializer, with one `bulk_create`
+    and one `bulk_update` per model. Writes of the model are flushed earlier,
+    when the unique validation of the model is run.
+    An instance registered for update several times is written once with all the modified fields.
+    Every write keeps the path of the nested field it was registered by, for the stats.
+    """
+
+    attribute_name = "_nested_unit_of_work"
+
+    def __init__(self):
+        self.creates: dict = {}
+        self.updates: dict = {}
+        self.batch_sizes: dict = {}
+
+    def register_create(
+        self,
+        model: type[models.Model],
+        instances: Iterable,
+        batch_size: Optional[int] = None,
+        path: str = "",
+    ):
+        """
+        Adds new instances to be inserted on flush
+        :param model: model class
+        :param instances: unsaved model instances
+        :param batch_size: size of the inserted chunks
+        :param path: path of the nested field the instances are saved by
+        :return: None
+        """
+        self.creates.setdefault(model, []).extend((instance, path) for instance in instances)
+        self._set_batch_size(model, batch_size)
+
+    def register_update(
+        self,
+        model: type[models.Model],
+        instance: models.Model,
+        fields: Iterable[str],
+        batch_size: Optional[int] = None,
+        path: str = "",
+    ):
+        """
+        Adds modified instance to be written on flush
+        :param model: model class
+        :param instance: modified model instance
+        :param fields: names of the modified model fields
+        :param batch_size: size of the updated chunks
+        :param path: path of the nested field the instance is saved by
+        :return: None
+        """
+        instances = self.updates.setdefault(model, {})
+        _, update_fields, _ = instances.setdefault(id(instance), (instance, set(), path))
+        update_fields.update(fields)
+        self._set_batch_size(model, batch_size)
+
+    def _set_batch_size(self, model: type[models.Model], batch_size: Optional[int]):
+        if batch_size is not None:
+            self.batch_sizes.setdefault(model, batch_size)
+
+    @staticmethod
+    def is_owner(serializer) -> bool:
+        """
+        Indicates if the serializer executes the collected writes: the outermost nested serializer
+        of the chain of its parents. Serializers without nested parents, e.g. the fields
+        of a plain serializer, execute the writes at the end of their own `create/update`.
+        :param serializer: nested serializer or nested list serializer
+        :return: if the serializer should flush the writes
+        """
+        parent = serializer.parent
+        while parent is not None:
+            if hasattr(parent, "_flush_unit_of_work"):
+                return False
+            parent = parent.parent
+        return True
+
+    @classmethod
+    def flush_pending(cls, serializer, model: type[models.Model]):
+        """
+        Executes the writes of the model collected so far in the tree of the serializer,
+        so that the queries of the tree, like the unique validation, see them
+        :param serializer: any serializer of the tree
+        :param model: model class
+        :return: None
+        """
+        state = serializer.root.__dict__.get(cls.attribute_name)
+        if state is not None:
+            state.flush(model)
+
+    def flush(self, model: Optional[type[models.Model]] = None):
+        """
+        Executes the collected writes, grouped by model
+        :param model: model class to execute the writes of, all the models by default
+        :return: None
+        """
+        if model is None:
+            creates, self.creates = self.creates, {}
+            updates, self.updates = self.updates, {}
+        else:
+            creates = {model: self.creates.pop(model)} if model in self.creates else {}
+            updates = {model: self.updates.pop(model)} if model in self.updates else {}
+        for model, instances in creates.items():
+            with NestedStatsRecorder.record_bulk_write("insert", [path for _, path in instances]):
+                model._default_manager.bulk_create(  # ty: ignore[unresolved-attribute]
+                    [instance for instance, _ in instances], batch_size=self.batch_sizes.get(model)
+                )
+        for model, instances in updates.items():
+            update_fields = set()
+            for _, fields, _ in instances.values():
+                update_fields.update(fields)
+            if not update_fields:
+                continue
+            with NestedStatsRecorder.record_bulk_write(
+                "update", [path for _, _, path in instances.values()]
+            ):
+                model._default_manager.bulk_update(  # ty: ignore[unresolved-attribute]
+                    [instance for instance, _, _ in instances.values()],
+                    sorted(update_fields),
+                    batch_size=self.batch_sizes.get(model),
+                )
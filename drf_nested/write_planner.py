@@ -0,0 +1,337 @@
+from typing import List, Optional, Tuple
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections, models, router
+from rest_framework.serializers import ListSerializer
+from rest_framework.utils import model_meta
+
+from drf_nested.mixins.base_nested_mixin import BaseNestedMixin
+from drf_nested.mixins.nestable_mixin import NestableMixin
+from drf_nested.mixins.through_mixin import ThroughMixin
+from drf_nested.mixins.unique_field_mixin import UniqueFieldMixin
+from drf_nested.mixins.unique_together_mixin import UniqueTogetherMixin
+from drf_nested.utils import NestedStatsRecorder
+
+
+class NotPlannable(Exception):
+    """
+    Raised when the nested data can't be written by the planner
+    and should be saved by the regular recursive `create` calls
+    """
+
+
+class WriteStage:
+    """
+    Single batched statement of the write plan: insert of all the instances of the model
+    that depend only on the instances inserted by the previous stages.
+    """
+
+    operation = "insert"
+
+    def __init__(self, rank: int, model: type[models.Model]):
+        self.rank = rank
+        self.model = model
+        self.instances: list = []
+        # Instance attributes, which values are known only after the previous stages are executed
+        self.links: List[Tuple[models.Model, str, models.Model, bool]] = []
+
+    @property
+    def name(self) -> str:
+        return "%s %s" % (self.operation, self.model._meta.label)
+
+    def add(self, instance: models.Model, links: list):
+        self.instances.append(instance)
+        self.links.extend((instance, *link) for link in links)
+
+    def execute(self, batch_size: Optional[int] = None):
+        for instance, attr, target, use_pk in self.links:
+            setattr(instance, attr, target.pk if use_pk else target)
+        with NestedStatsRecorder.record_bulk_write("insert", [None] * len(self.instances)):
+            return self.model._default_manager.bulk_create(  # ty: ignore[unresolved-attribute]
+                self.instances, batch_size=batch_size
+            )
+
+    def __repr__(self):
+        return "<%s %s (%s)>" % (self.__class__.__name__, self.name, len(self.instances))
+
+
+class NestedWritePlan:
+    """
+    Dependency ordered stages of the nested create.
+    Every stage depends only on the stages with lower rank.
+    """
+
+    def __init__(self):
+        self.roots: list = []
+        self._stages: dict = {}
+        self._validations: dict = {}
+
+    def get_stage(self, rank: int, model: type[models.Model]) -> WriteStage:
+        stage = self._stages.get((rank, model))
+        if stage is None:
+            stage = self._stages[(rank, model)] = WriteStage(rank, model)
+        return stage
+
+    def snapshot(self) -> tuple:
+        """
+        Remembers the size of the plan to roll back the partially planned item
+        :return: stage and validation sizes
+        """
+        return (
+            {key: (len(stage.instances), len(stage.links)) for key, stage in self._stages.items()},
+            {key: len(items) for key, (_, items) in self._validations.items()},
+        )
+
+    def rollback(self, snapshot: tuple):
+        """
+        Truncates the stages and validations to the sizes of the snapshot
+        :param snapshot: stage and validation sizes
+        :return: None
+        """
+        stage_sizes, validation_sizes = snapshot
+        for key in list(self._stages):
+            if key not in stage_sizes:
+                del self._stages[key]
+                continue
+            stage = self._stages[key]
+            instances_count, links_count = stage_sizes[key]
+            del stage.instances[instances_count:]
+            del stage.links[links_count:]
+        for key in list(self._validations):
+            if key not in validation_sizes:
+                del self._validations[key]
+                continue
+            del self._validations[key][1][validation_sizes[key] :]
+
+    @property
+    def stages(self) -> List[WriteStage]:
+        return sorted(
+            self._stages.values(), key=lambda stage: (stage.rank, stage.model._meta.label)
+        )
+
+    def add_validation(self, serializer, item: dict):
+        """
+        Collects the item to validate its unique fields together with all the items
+        saved by the same serializer
+        :param serializer: serializer that would save the item
+        :param item: validated item
+        :return: None
+        """
+        self._validations.setdefault(id(serializer), (serializer, []))[1].append(item)
+
+    def validate(self) -> bool:
+        """
+        Runs unique and unique together validation with a single query per serializer and constraint
+        :return: if all the items are valid
+        """
+        for serializer, items in self._validations.values():
+            if isinstance(serializer, UniqueFieldMixin) and serializer._validate_unique_many(items):
+                return False
+            if isinstance(
+                serializer, UniqueTogetherMixin
+            ) and serializer._validate_unique_together_many(items):
+                return False
+        return True
+
+    def execute(self, batch_size: Optional[int] = None) -> list:
+        """
+        Executes all the stages one by one
+        :param batch_size: size of the inserted chunks
+        :return: root instances
+        """
+        for stage in self.stages:
+            stage.execute(batch_size)
+        return self.roots
+
+
+class NestedWritePlanner:
+    """
+    Compiles the validated nested data into a write plan.
+    Every nested item is visited once: its direct relations are planned before it,
+    its reverse and generic relations after it, many-to-many links after both of the connected items.
+    The planner supports only the creation of new items, the serializers without custom `create`
+    and the models without custom `save`; anything else makes the data not plannable.
+    """
+
+    def __init__(self, serializer: BaseNestedMixin):
+        self.serializer = serializer
+
+    def plan(self, items: list) -> Optional[NestedWritePlan]:
+        """
+        Builds the plan for the list of validated items of the serializer
+        :param items: validated items
+        :return: write plan or `None`, if the items should be saved by the regular `create`
+        """
+        plan = NestedWritePlan()
+        try:
+            for item in items:
+                instance, _ = self._plan_item(self.serializer, item, plan)
+                plan.roots.append(instance)
+        except NotPlannable:
+            return None
+        if not plan.validate():
+            return None
+        return plan
+
+    def plan_each(self, items: list) -> Tuple[Optional[NestedWritePlan], List[int]]:
+        """
+        Builds the plan for the plannable items of the list, skipping the rest
+        :param items: validated items
+        :return: write plan, which roots are the instances of the planned items, and the item indexes,
+        or `None` and no indexes, if no item could be planned or the unique validation fails
+        """
+        plan = NestedWritePlan()
+        indexes = []
+        for index, item in enumerate(items):
+            snapshot = plan.snapshot()
+            try:
+                instance, _ = self._plan_item(self.serializer, item, plan)
+            except NotPlannable:
+                # Partial stages of the item are dropped, it is saved by the regular `create`
+                plan.rollback(snapshot)
+                continue
+            plan.roots.append(instance)
+            indexes.append(index)
+        if not indexes or not plan.validate():
+            return None, []
+        return plan, indexes
+
+    def _check_serializer(self, serializer):
+        if isinstance(serializer, ThroughMixin) or self.serializer._has_custom_method(
+            serializer, "create"
+        ):
+            raise NotPlannable()
+        if isinstance(serializer, NestableMixin) and (
+            not serializer.allow_create or serializer.preserve_provided
+        ):
+            raise NotPlannable()
+        if getattr(getattr(serializer, "Meta", None), "forbidden_on_create", None):
+            raise NotPlannable()
+
+        model = serializer.Meta.model
+        if model.save is not models.Model.save or model._meta.parents:
+            raise NotPlannable()
+        connection = connections[router.db_for_write(model)]
+        if not connection.features.can_return_rows_from_bulk_insert:
+            raise NotPlannable()
+
+    def _plan_item(self, serializer, item, plan: NestedWritePlan, rank: int = 0, links=()):
+        """
+        Adds the item and all its nested items to the plan
+        :param serializer: serializer that would save the item
+        :param item: validated item
+        :param plan: write plan
+        :param rank: minimal stage rank of the item
+        :param links: attributes of the item set from the previously planned instances
+        :return: unsaved instance and its stage rank
+        """
+        self._check_serializer(serializer)
+        model = serializer.Meta.model
+        if not isinstance(item, dict) or item.get(model._meta.pk.attname) is not None:
+            raise NotPlannable()
+
+        data = dict(item)
+        nested_types = {}
+        if isinstance(serializer, BaseNestedMixin):
+            data, nested_fields_data = serializer._get_nested_fields(data, remove_fields=True)
+            for field_name in nested_fields_data:
+                if len(serializer._get_nested_relation(field_name).kinds) > 1:
+                    raise NotPlannable()
+            nested_types = serializer.extract_nested_types(nested_fields_data)
+
+        field_info = model_meta.get_field_info(model)
+        if any(
+            relation_info.to_many and field_name in data
+            for field_name, relation_info in field_info.relations.items()
+        ):
+            raise NotPlannable()
+
+        links = list(links)
+        for field in nested_types.get("direct_relations", []):
+            if isinstance(field["data"], dict):
+                related_instance, related_rank = self._plan_item(
+                    serializer._get_serializer_by_field_name(field["name"]), field["data"], plan
+                )
+                rank = max(rank, related_rank + 1)
+                links.append((field["original_name"], related_instance, False))
+
+        plan.add_validation(serializer, data)
+        instance = model(**data)
+        plan.get_stage(rank, model).add(instance, links)
+
+        for field in nested_types.get("reverse_relations", []):
+            child = self._get_child_serializer(serializer, field["name"])
+            related_name = serializer.get_related_name(
+                serializer.get_model_field_name(field["name"])
+            )
+            for child_item in self._get_items(field["data"]):
+                self._plan_item(
+                    child, child_item, plan, rank + 1, [(related_name, instance, False)]
+                )
+
+        for field in nested_types.get("generic_relations", []):
+            child = self._get_child_serializer(serializer, field["name"])
+            content_type, content_type_name, object_id_name = self._get_generic_relation_fields(
+                serializer, field["name"], model
+            )
+            for child_item in self._get_items(field["data"]):
+                child_item = dict(child_item, **{content_type_name: content_type.pk})
+                self._plan_item(
+                    child, child_item, plan, rank + 1, [(object_id_name, instance, True)]
+                )
+
+        for field in nested_types.get("many_to_many_fields", []):
+            child = self._get_child_serializer(serializer, field["name"])
+            through, source_name, target_name = self._get_through(
+                model, serializer.get_model_field_name(field["name"])
+            )
+            for child_item in self._get_items(field["data"]):
+                child_instance, child_rank = self._plan_item(child, child_item, plan)
+                plan.get_stage(max(rank, child_rank) + 1, through).add(
+                    through(),
+                    [(source_name, instance, False), (target_name, child_instance, False)],
+                )
+
+        return instance, rank
+
+    def _get_child_serializer(self, serializer, field_name: str):
+        child = serializer._get_serializer_by_field_name(field_name)
+        return child.child if isinstance(child, ListSerializer) else child
+
+    def _get_generic_relation_fields(self, serializer, field_name: str, model) -> tuple:
+        """
+        Gets the content type and the field names of the generic relation, like the regular `create`
+        :param serializer: serializer that owns the generic relation field
+        :param field_name: generic relation field name
+        :param model: model class of the connected objects
+        :return: content type, content type foreign key attribute name and object id field name
+        """
+        try:
+            return serializer._get_generic_relation_fields(
+                field_name, model, router.db_for_write(model)
+            )
+        except (AttributeError, FieldDoesNotExist):
+            raise NotPlannable()
+
+    def _get_items(self, data) -> list:
+        if isinstance(data, list):
+            return data
+        if isinstance(data, dict):
+            return [data]
+        return []
+
+    def _get_through(self, model: type[models.Model], field_name: str):
+        """
+        Gets auto-created through model of the many-to-many field and the names of its foreign keys
+        :param model: model class
+        :param field_name: many-to-many field name, could be the reverse one
+        :return: through model, source and target foreign key names
+        """
+        descriptor = getattr(model, field_name)
+        field = descriptor.field
+        through = field.remote_field.through
+        if not through._meta.auto_created:
+            raise NotPlannable()
+        if descriptor.reverse:
+            return through, field.m2m_reverse_field_name(), field.m2m_field_name()
+        return through, field.m2m_field_name(), field.m2m_reverse_field_name()
@@ -0,0 +1,317 @@
+"""
+Wall time, query count and peak memory of the nested create and update
+and of the nested fields extraction for synthetic payloads of the example serializers.
+
+Run with `python manage.py benchmark_nested --breadth 100 --depth 2 --output results.json`.
+"""
+
+import time
+import tracemalloc
+from copy import deepcopy
+
+from django.db import connection, transaction
+
+from nested_example.models import Employee, User
+from nested_example.serializers import (
+    CompanyBulkGroupSerializer,
+    CompanySerializer,
+    EmployeeSerializer,
+    GroupSerializer,
+    RoleSerializer,
+)
+
+OPERATIONS = ("create", "update", "partial_update", "trim", "extract")
+
+
+class Scenario:
+    """
+    Serializer with the synthetic payload of given breadth (length of the nested lists)
+    and depth (number of the nested levels, up to `max_depth` supported by the serializer)
+    """
+
+    serializer_class = None
+    nested_fields: tuple = ()
+    max_depth = 1
+
+    def __init__(self, breadth: int, depth: int):
+        self.check_depth(depth)
+        self.breadth = breadth
+        self.depth = depth
+
+    @classmethod
+    def check_depth(cls, depth: int):
+        if not 1 <= depth <= cls.max_depth:
+            raise ValueError("%s supports the depth from 1 to %s" % (cls.__name__, cls.max_depth))
+
+    def setup(self):
+        """
+        Creates the objects referenced by the payload
+        """
+
+    def payload(self) -> dict:
+        raise NotImplementedError
+
+    def change(self, data: dict) -> dict:
+        """
+        Modifies the values of the nested items in the representation of the created instance
+        """
+        data = deepcopy(data)
+        for field_name in self.nested_fields:
+            for index, item in enumerate(data.get(field_name) or []):
+                self.change_item(item, index)
+        return data
+
+    def change_item(self, item: dict, index: int):
+        raise NotImplementedError
+
+    def trim(self, data: dict) -> dict:
+        """
+        Keeps only the first half of the nested items in the representation of the created instance
+        """
+        data = deepcopy(data)
+        for field_name in self.nested_fields:
+            if data.get(field_name):
+                data[field_name] = data[field_name][: len(data[field_name]) // 2]
+        return data
+
+
+class CompanyScenario(Scenario):
+    serializer_class = CompanySerializer
+    nested_fields = ("comments", "managers")
+    max_depth = 2
+
+    def payload(self) -> dict:
+        payload = {
+            "name": "Company",
+            "comments": [{"text": "Comment %s" % index} for index in range(self.breadth)],
+        }
+        if self.depth > 1:
+            payload["managers"] = [
+                {"user": {"username": "manager%s" % index}, "level": "level%s" % index}
+                for index in range(self.breadth)
+            ]
+        return payload
+
+    def change_item(self, item: dict, index: int):
+        if "text" in item:
+            item["text"] = "Changed %s" % index
+        else:
+            item["level"] = "changed%s" % index
+
+
+class CompanyGroupsScenario(Scenario):
+    """
+    Single wide nested list of the groups, inserted and updated in bulk
+    """
+
+    serializer_class = CompanyBulkGroupSerializer
+    nested_fields = ("groups",)
+
+    def payload(self) -> dict:
+        return {
+            "name": "Company",
+            # Group names are limited to 10 symbols
+            "groups": [{"name": "G%s" % index} for index in range(self.breadth)],
+        }
+
+    def change_item(self, item: dict, index: int):
+        item["name"] = "C%s" % index
+
+
+class RoleScenario(Scenario):
+    serializer_class = RoleSerializer
+    nested_fields = ("employees",)
+
+    def setup(self):
+        self.employees = [
+            Employee.objects.create(status="active", user=User.objects.create(username="e%s" % i))
+            for i in range(self.breadth)
+        ]
+
+    def payload(self) -> dict:
+        return {
+            "name": "Role",
+            "permission": "high",
+            "employees": [
+                {"employee_id": employee.pk, "name": "Assignment %s" % index}
+                for index, employee in enumerate(self.employees)
+            ],
+        }
+
+    def change_item(self, item: dict, index: int):
+        item["name"] = "Changed %s" % index
+
+
+class GroupScenario(Scenario):
+    serializer_class = GroupSerializer
+    nested_fields = ("members",)
+    max_depth = CompanyScenario.max_depth + 1
+
+    def payload(self) -> dict:
+        payload = {
+            "name": "Group",
+            "members": [{"username": "member%s" % index} for index in range(self.breadth)],
+        }
+        if self.depth > 1:
+            payload["company"] = CompanyScenario(self.breadth, self.depth - 1).payload()
+        return payload
+
+    def change_item(self, item: dict, index: int):
+        item["username"] = "changed%s" % index
+
+
+class EmployeeScenario(Scenario):
+    """
+    Employee has a single direct relation, so the breadth is the number of employees
+    saved together with `many=True`
+    """
+
+    serializer_class = EmployeeSerializer
+
+    def payload(self) -> list:
+        return [
+            {"status": "active", "user": {"username": "employee%s" % index}}
+            for index in range(self.breadth)
+        ]
+
+    def change(self, data: list) -> list:
+        data = deepcopy(data)
+        for index, item in enumerate(data):
+            item["status"] = "changed"
+            item["user"]["username"] = "changed%s" % index
+        return data
+
+    def trim(self, data: list) -> list:
+        data = deepcopy(data)
+        for item in data:
+            item["user"] = None
+        return data
+
+
+SCENARIOS = {
+    "company": CompanyScenario,
+    "company_groups": CompanyGroupsScenario,
+    "role": RoleScenario,
+    "group": GroupScenario,
+    "employee": EmployeeScenario,
+}
+
+
+def _save(serializer_class, instance, data, partial=False):
+    # Lists are created and updated by the nested list serializer, matching the items by pk
+    serializer = serializer_class(
+        instance=instance, data=data, partial=partial, many=isinstance(data, list)
+    )
+    serializer.is_valid(raise_exception=True)
+    serializer.save()
+    return serializer
+
+
+def measure_peak(func, *args, **kwargs):
+    """
+    Calls the function and measures the peak of the memory allocated during the call
+    :return: function result and peak allocation in bytes
+    """
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        result = func(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak - baseline
+
+
+class QueryCounter:
+    """
+    Database execute wrapper counting the queries, unlike the query log it has no size limit
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def _extract(serializer_class, data):
+    """
+    Validates the payload and builds the function extracting the nested fields of the validated data
+    """
+    many = isinstance(data, list)
+    serializer = serializer_class(data=data, many=many)
+    serializer.is_valid(raise_exception=True)
+    if many:
+        items = [dict(item) for item in serializer.validated_data]
+        return lambda: [serializer.child._get_nested_fields(item) for item in items]
+    validated_data = dict(serializer.validated_data)
+    return lambda: serializer._get_nested_fields(validated_data)
+
+
+def _prepare(scenario: Scenario, operation: str):
+    """
+    Creates the instance to update and builds the function running the measured operation
+    """
+    scenario.setup()
+    serializer_class = scenario.serializer_class
+    payload = scenario.payload()
+    if operation == "create":
+        return lambda: _save(serializer_class, None, payload)
+    if operation == "extract":
+        return _extract(serializer_class, payload)
+
+    created = _save(serializer_class, None, payload)
+    instance, data = created.instance, created.data
+    if operation == "update":
+        return lambda: _save(serializer_class, instance, scenario.change(data))
+    if operation == "partial_update":
+        return lambda: _save(serializer_class, instance, scenario.change(data), partial=True)
+    return lambda: _save(serializer_class, instance, scenario.trim(data))
+
+
+def measure(scenario: Scenario, operation: str) -> dict:
+    """
+    Measures the operation twice inside the rolled back transactions:
+    wall time and query count first and peak memory without the query counting afterwards
+    :param scenario: benchmark scenario
+    :param operation: operation name
+    :return: wall time in seconds, query count and peak allocation in bytes
+    """
+    with transaction.atomic():
+        run = _prepare(scenario, operation)
+        queries = QueryCounter()
+        with connection.execute_wrapper(queries):
+            start = time.perf_counter()
+            run()
+            duration = time.perf_counter() - start
+        transaction.set_rollback(True)
+
+    with transaction.atomic():
+        run = _prepare(scenario, operation)
+        _, peak = measure_peak(run)
+        transaction.set_rollback(True)
+
+    return {"time": duration, "queries": queries.count, "peak_memory": peak}
+
+
+def run(breadth: int = 100, depth: int = 2, scenarios=None, operations=None) -> dict:
+    """
+    Runs the benchmarks of the scenarios
+    :param breadth: length of the nested lists
+    :param depth: number of the nested levels
+    :param scenarios: scenario names, all the scenarios supporting the depth by default
+    :param operations: operation names, all by default
+    :return: results mapped by the scenario and the operation
+    """
+    if not scenarios:
+        scenarios = [name for name, scenario in SCENARIOS.items() if depth <= scenario.max_depth]
+    for name in scenarios:
+        SCENARIOS[name].check_depth(depth)
+    results = {}
+    for name in scenarios:
+        results[name] = {}
+        for operation in operations or OPERATIONS:
+            results[name][operation] = measure(SCENARIOS[name](breadth, depth), operation)
+    return results
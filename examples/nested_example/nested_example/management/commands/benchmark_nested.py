@@ -0,0 +1,79 @@
+import json
+import subprocess
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_databases, teardown_databases
+
+from nested_example.benchmarks import suite
+
+
+def get_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = "Measures wall time, query count and peak memory of the nested create and update"
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--breadth", type=int, default=100, help="Nested lists length")
+        parser.add_argument("--depth", type=int, default=2, help="Number of nested levels")
+        parser.add_argument(
+            "--scenario", action="append", choices=sorted(suite.SCENARIOS), dest="scenarios"
+        )
+        parser.add_argument(
+            "--operation", action="append", choices=suite.OPERATIONS, dest="operations"
+        )
+        parser.add_argument("--output", help="Path of the JSON file to save the results to")
+        parser.add_argument("--compare", help="Path of the JSON file with the previous results")
+
+    def handle(self, *args, **options):
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            results = suite.run(
+                options["breadth"], options["depth"], options["scenarios"], options["operations"]
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        finally:
+            teardown_databases(old_config, verbosity=0)
+
+        previous = {}
+        if options["compare"]:
+            with open(options["compare"]) as file:
+                previous = json.load(file)["results"]
+
+        for scenario, operations in results.items():
+            for operation, result in operations.items():
+                line = "%-15s %-16s %9.1f ms %7s queries %10.1f KiB" % (
+                    scenario,
+                    operation,
+                    result["time"] * 1000,
+                    result["queries"],
+                    result["peak_memory"] / 1024,
+                )
+                previous_result = previous.get(scenario, {}).get(operation)
+                if previous_result:
+                    line += "   (time x%.2f, queries %+d)" % (
+                        result["time"] / previous_result["time"] if previous_result["time"] else 0,
+                        result["queries"] - previous_result["queries"],
+                    )
+                self.stdout.write(line)
+
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                json.dump(
+                    {
+                        "revision": get_revision(),
+                        "breadth": options["breadth"],
+                        "depth": options["depth"],
+                        "results": results,
+                    },
+                    file,
+                    indent=2,
+                )
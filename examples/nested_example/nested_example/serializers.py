@@ -1,6 +1,7 @@
 from django.contrib.contenttypes.models import ContentType
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
+from rest_framework.validators import UniqueValidator
 
 from drf_nested.mixins import (
     CreateNestedMixin,
@@ -112,6 +113,21 @@ class RoleSerializer(NestedSerializer, serializers.HyperlinkedModelSerializer):
         fields = ("id", "employees", "permission", "name")
 
 
+class RoleBulkThroughSerializer(NestedSerializer, serializers.HyperlinkedModelSerializer):
+    id = serializers.IntegerField(required=False)
+    employees = EmployeeRoleSerializer(
+        many=True,
+        required=False,
+        write_source="employee_roles",
+        source="employee_roles",
+        bulk_through=True,
+    )
+
+    class Meta:
+        model = Role
+        fields = ("id", "employees", "permission", "name")
+
+
 class RoleNestedSerializer(NestedSerializer, serializers.HyperlinkedModelSerializer):
     id = serializers.IntegerField(required=False)
     employees = EmployeeRoleSerializer(
@@ -194,6 +210,126 @@ class UserGroupSerializer(NestedSerializer, serializers.HyperlinkedModelSerializ
         fields = ("id", "username", "is_active", "groups")
 
 
+class CompanyBulkGroupSerializer(NestedSerializer, serializers.HyperlinkedModelSerializer):
+    id = serializers.IntegerField(required=False)
+    groups = SimpleGroupSerializer(
+        many=True,
+        required=False,
+        allow_null=True,
+        bulk_create=True,
+        bulk_update=True,
+        bulk_batch_size=2,
+    )
+
+    class Meta:
+        model = Company
+        fields = ("id", "name", "groups")
+
+
+class CompanyWrapperSerializer(serializers.Serializer):
+    company = CompanyBulkGroupSerializer()
+
+    def create(self, validated_data):
+        return {"company": self.fields["company"].create(validated_data["company"])}
+
+
+class FlatManagerSerializer(UniqueTogetherMixin, NestableMixin, serializers.ModelSerializer):
+    id = serializers.IntegerField(required=False)
+
+    class Meta:
+        model = Manager
+        fields = ("id", "user", "level")
+
+
+class CompanyFlatManagerSerializer(NestedSerializer, serializers.ModelSerializer):
+    id = serializers.IntegerField(required=False)
+    managers = FlatManagerSerializer(many=True, required=False)
+
+    class Meta:
+        model = Company
+        fields = ("id", "name", "managers")
+
+
+class UniqueUserManagerSerializer(UniqueFieldMixin, NestableMixin, serializers.ModelSerializer):
+    id = serializers.IntegerField(required=False)
+    user = serializers.PrimaryKeyRelatedField(
+        queryset=User.objects.all(), validators=[UniqueValidator(Manager.objects.all())]
+    )
+
+    class Meta:
+        model = Manager
+        fields = ("id", "user", "level")
+
+
+class EmployeeUsernameSerializer(UniqueFieldMixin, NestableMixin, serializers.ModelSerializer):
+    id = serializers.IntegerField(required=False)
+    username = serializers.CharField(
+        source="user.username", validators=[UniqueValidator(User.objects.all())]
+    )
+
+    class Meta:
+        model = Employee
+        fields = ("id", "status", "username")
+
+
+class CompanyUniqueManagerSerializer(NestedSerializer, serializers.ModelSerializer):
+    id = serializers.IntegerField(required=False)
+    managers = UniqueUserManagerSerializer(many=True, required=False)
+
+    class Meta:
+        model = Company
+        fields = ("id", "name", "managers")
+
+
+class GroupSyncSerializer(NestedSerializer, serializers.HyperlinkedModelSerializer):
+    id = serializers.IntegerField(required=False)
+    members = UserSerializer(
+        required=False,
+        many=True,
+        source="active_users",
+        write_source="members",
+        sync_many_to_many=True,
+    )
+
+    class Meta:
+        model = Group
+        fields = ("id", "name", "members")
+
+
+class SimpleCommentSerializer(GenericRelationMixin, serializers.ModelSerializer):
+    id = serializers.IntegerField(required=False)
+
+    class Meta:
+        model = Comment
+        fields = ("id", "text", "object_id", "content_type_id")
+
+
+class CompanyCommentsSerializer(NestableMixin, NestedSerializer, serializers.ModelSerializer):
+    id = serializers.IntegerField(required=False)
+    comments = SimpleCommentSerializer(
+        many=True, required=False, bulk_create=True, bulk_update=True
+    )
+
+    class Meta:
+        model = Company
+        fields = ("id", "name", "comments")
+
+
+class CompanyNotesSerializer(NestableMixin, NestedSerializer, serializers.ModelSerializer):
+    id = serializers.IntegerField(required=False)
+    notes = SimpleCommentSerializer(
+        many=True,
+        required=False,
+        source="comments",
+        bulk_create=True,
+        bulk_update=True,
+    )
+
+    class Meta:
+        model = Company
+        fields = ("id", "name", "notes")
+
+
 class UserGroupErrorRaisingSerializer(NestedSerializer, serializers.HyperlinkedModelSerializer):
     id = serializers.IntegerField(required=False)
     groups = GroupErrorRaisingSerializer(many=True, required=False, allow_null=True)
@@ -0,0 +1,133 @@
+from unittest import mock
+
+from django.db import models
+from django.test import TestCase
+from rest_framework.serializers import ListSerializer
+
+from drf_nested.serializers import NestedListSerializer
+from drf_nested.utils import NestedInstanceCache, NestedUnitOfWork
+from nested_example.models import Group
+from nested_example.serializers import (
+    CompanySerializer,
+    CompanyWrapperSerializer,
+    GroupSerializer,
+    RoleSerializer,
+    SimpleGroupSerializer,
+)
+
+
+class BaseNestedMixinTest(TestCase):
+    def test_relation_plan_shared_between_instances(self):
+        plan = CompanySerializer()._relation_plan
+        self.assertIs(CompanySerializer()._relation_plan, plan)
+        self.assertIsNot(GroupSerializer()._relation_plan, plan)
+
+    def test_relation_plan_invalidated_on_fields_change(self):
+        serializer = CompanySerializer()
+        self.assertIn("comments", serializer.nested_field_names)
+
+        del serializer.fields["comments"]
+        serializer.invalidate_relation_plan()
+        self.assertNotIn("comments", serializer.nested_field_names)
+        self.assertIn("comments", CompanySerializer().nested_field_names)
+
+    def test_nested_relation(self):
+        relation = RoleSerializer()._get_nested_relation("employee_roles")
+        self.assertEqual(relation.field_name, "employee_roles")
+        self.assertEqual(relation.model_field_name, "employee_roles")
+        self.assertEqual(relation.kinds, ("reverse_relations", "many_to_many_fields"))
+        self.assertEqual(relation.pk_name, "id")
+        self.assertEqual(relation.related_name, "role")
+
+        relation = GroupSerializer()._get_nested_relation("members")
+        self.assertEqual(relation.kinds, ("many_to_many_fields",))
+        self.assertEqual(relation.related_name, "groups")
+
+    def test_field_source_index(self):
+        serializer = GroupSerializer()
+        self.assertEqual(serializer.get_field_name_by_source("active_users"), "members")
+        self.assertEqual(serializer.get_field_name_by_source("members"), "members")
+        self.assertEqual(serializer.get_field_name_by_source("unknown"), "unknown")
+        self.assertEqual(serializer.get_model_field_name("active_users"), "members")
+        self.assertEqual(serializer.get_model_field_name("company"), "company")
+
+        serializer = RoleSerializer()
+        self.assertEqual(serializer.get_field_name_by_source("employee_roles"), "employees")
+        self.assertEqual(serializer.get_model_field_name("employees"), "employee_roles")
+
+    def test_instance_cache_preloaded_by_list_serializer(self):
+        groups = [Group.objects.create(name="Group %s" % i) for i in range(3)]
+        serializer = SimpleGroupSerializer(
+            data=[{"id": group.pk, "name": "New name"} for group in groups], many=True
+        )
+        self.assertIsInstance(serializer, NestedListSerializer)
+        with self.assertNumQueries(1):
+            serializer.is_valid(raise_exception=True)
+        with self.assertNumQueries(0):
+            self.assertEqual(serializer.child._instance_cache.get(Group, groups[0].pk), groups[0])
+
+    def test_list_serializer_class_kept(self):
+        class PlainListGroupSerializer(GroupSerializer):
+            class Meta(GroupSerializer.Meta):
+                list_serializer_class = ListSerializer
+
+        self.assertIsInstance(GroupSerializer(many=True), NestedListSerializer)
+        self.assertIsInstance(SimpleGroupSerializer(many=True), NestedListSerializer)
+        self.assertIs(type(PlainListGroupSerializer(many=True)), ListSerializer)
+
+    def test_nested_list_serializer_built_directly(self):
+        with mock.patch.object(
+            NestedListSerializer, "__init__", autospec=True, side_effect=ListSerializer.__init__
+        ) as init_mock:
+            groups = GroupSerializer(many=True, min_length=2, required=False)
+
+        init_mock.assert_called_once()
+        self.assertIsInstance(groups, NestedListSerializer)
+        self.assertEqual(groups.min_length, 2)
+        self.assertFalse(groups.required)
+        self.assertIsInstance(groups.child, GroupSerializer)
+
+    def test_instance_cache_used_for_default_querysets_only(self):
+        self.assertTrue(NestedInstanceCache.is_cacheable(Group.objects.all()))
+        self.assertFalse(NestedInstanceCache.is_cacheable(Group.objects.filter(name="Name")))
+        self.assertFalse(NestedInstanceCache.is_cacheable(Group.objects.all()[:5]))
+        # The cache loads the instances from the default database
+        self.assertFalse(NestedInstanceCache.is_cacheable(Group.objects.using("other")))
+
+        class FilteredManager(models.Manager):
+            def get_queryset(self):
+                return super().get_queryset().filter(company__isnull=True)
+
+        manager = FilteredManager()
+        manager.model = Group
+        # Instances of another manager could be hidden by the filtered default manager
+        with mock.patch.object(Group._meta, "default_manager", manager):
+            self.assertFalse(NestedInstanceCache.is_cacheable(Group.objects.all()))
+
+    def test_unit_of_work_merges_writes(self):
+        group = Group.objects.create(name="Group")
+        same_group = SimpleGroupSerializer()._instance_cache.get(Group, group.pk)
+        unit_of_work = NestedUnitOfWork()
+        unit_of_work.register_create(Group, [Group(name="First"), Group(name="Second")])
+        same_group.name = "New name"
+        unit_of_work.register_update(Group, same_group, ["name"])
+        unit_of_work.register_update(Group, same_group, ["company"])
+        with self.assertNumQueries(2):
+            unit_of_work.flush()
+        with self.assertNumQueries(0):
+            unit_of_work.flush()
+
+        group.refresh_from_db()
+        self.assertEqual(group.name, "New name")
+        self.assertEqual(Group.objects.count(), 3)
+
+    def test_unit_of_work_flushed_under_plain_serializer(self):
+        wrapper = CompanyWrapperSerializer(
+            data={"company": {"name": "Company", "groups": [{"name": "First"}, {"name": "Second"}]}}
+        )
+        wrapper.is_valid(raise_exception=True)
+        wrapper.save()
+
+        # The nested serializer has no nested parent, so it executes the bulk writes itself
+        company = wrapper.instance["company"]
+        self.assertEqual(sorted(company.groups.values_list("name", flat=True)), ["First", "Second"])
@@ -1,11 +1,23 @@
 from copy import copy
+from unittest import mock
 
-from django.test import TestCase
+from django.db import connection, models
+from django.db.models.signals import post_save
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework.exceptions import ErrorDetail, ValidationError
 
+from drf_nested.serializers import NestedListSerializer
+from drf_nested.write_planner import NestedWritePlanner
+from nested_example.models import Comment, Group, Manager, User
 from nested_example.serializers import (
+    CompanyBulkGroupSerializer,
+    CompanyCommentsSerializer,
+    CompanyFlatManagerSerializer,
     CompanySerializer,
+    CompanyUniqueManagerSerializer,
     EmployeeSerializer,
+    EmployeeUsernameSerializer,
     GroupSerializer,
     RoleNestedSerializer,
     UserGroupErrorRaisingSerializer,
@@ -260,3 +272,461 @@ class NestedCreateMixinTest(TestCase):
 
         data = copy(employee_role.data)
         self.assertEqual(len(data.get("employees")), 1)
+
+    def test_create_reverse_nested_bulk_success(self):
+        company = CompanyBulkGroupSerializer(
+            data={
+                "name": "Company name",
+                "groups": [{"name": "Group %s" % i} for i in range(5)],
+            }
+        )
+        company.is_valid(raise_exception=True)
+        with CaptureQueriesContext(connection) as queries:
+            company.save()
+        self.assertIsNotNone(company.instance)
+        self.assertEqual(company.instance.groups.count(), 5)
+
+        # The groups are inserted in chunks of `bulk_batch_size` items
+        group_inserts = [
+            query
+            for query in queries.captured_queries
+            if query["sql"].startswith('INSERT INTO "nested_example_group"')
+        ]
+        self.assertEqual(len(group_inserts), 3)
+        self.assertEqual(
+            sorted(group["name"] for group in company.data["groups"]),
+            ["Group %s" % i for i in range(5)],
+        )
+
+    def test_create_reverse_nested_bulk_custom_save(self):
+        company = CompanyBulkGroupSerializer(
+            data={"name": "Company name", "groups": [{"name": "Group %s" % i} for i in range(3)]}
+        )
+        company.is_valid(raise_exception=True)
+        with mock.patch.object(Group, "save", autospec=True, side_effect=models.Model.save) as save:
+            company.save()
+
+        # The model with custom `save` is saved item by item
+        self.assertEqual(save.call_count, 3)
+        self.assertEqual(company.instance.groups.count(), 3)
+
+    def test_create_refresh_policy(self):
+        def create_queries(**save_kwargs):
+            policy = save_kwargs.get("refresh_policy")
+            company = CompanySerializer(
+                data={
+                    "name": "Company name",
+                    "managers": [
+                        {"user": {"username": "%s %s" % (policy, index)}, "level": "high"}
+                        for index in range(2)
+                    ],
+                }
+            )
+            company.is_valid(raise_exception=True)
+            with CaptureQueriesContext(connection) as queries:
+                company.save(**save_kwargs)
+            self.assertEqual(company.instance.managers.count(), 2)
+            return len(queries)
+
+        always = create_queries()
+        self.assertEqual(create_queries(refresh_policy="always"), always)
+        # Managers are not refreshed
+        root_only = create_queries(refresh_policy="root_only")
+        self.assertEqual(always - root_only, 2)
+        # The company is not refreshed either
+        self.assertEqual(root_only - create_queries(refresh_policy="never"), 1)
+        # There are no fields with database defaults
+        self.assertEqual(create_queries(refresh_policy="db_defaults_only"), root_only - 1)
+
+        with self.assertRaises(AssertionError):
+            create_queries(refresh_policy="sometimes")
+
+    def test_create_m2m_nested_unique_fail(self):
+        User.objects.create(username="taken")
+        group = GroupSerializer(
+            data={
+                "name": "Some name",
+                "members": [
+                    {"username": "username1"},
+                    {"username": "taken"},
+                    {"username": "username1"},
+                ],
+            }
+        )
+        group.is_valid(raise_exception=True)
+        with CaptureQueriesContext(connection) as queries:
+            with self.assertRaises(ValidationError) as verror:
+                group.save()
+
+        error = verror.exception
+        unique_error = {
+            "username": [ErrorDetail(string="This field must be unique.", code="unique")]
+        }
+        self.assertEqual(error.detail["members"], [unique_error, unique_error])
+        # Uniqueness of all the members is checked with a single query
+        unique_queries = [
+            query
+            for query in queries.captured_queries
+            if query["sql"].startswith('SELECT "nested_example_user"."id"')
+            and '"username" IN' in query["sql"]
+        ]
+        self.assertEqual(len(unique_queries), 1)
+
+    def test_create_many_to_many_nested_unique_together_fail(self):
+        first_user = User.objects.create(username="first")
+        second_user = User.objects.create(username="second")
+        Manager.objects.create(level="high", user=first_user)
+        company = CompanyFlatManagerSerializer(
+            data={
+                "name": "Some name",
+                "managers": [
+                    {"user": first_user.pk, "level": "high"},
+                    {"user": second_user.pk, "level": "low"},
+                    {"user": second_user.pk, "level": "low"},
+                    {"user": first_user.pk, "level": "low"},
+                ],
+            }
+        )
+        company.is_valid(raise_exception=True)
+        with CaptureQueriesContext(connection) as queries:
+            with self.assertRaises(ValidationError) as verror:
+                company.save()
+
+        error = verror.exception
+        unique_together_error = {
+            "non_field_errors": [
+                ErrorDetail(string="The fields level, user must make a unique set.", code="unique")
+            ]
+        }
+        self.assertEqual(error.detail["managers"], [unique_together_error, unique_together_error])
+        # Uniqueness of all the managers is checked with a single query
+        unique_together_queries = [
+            query
+            for query in queries.captured_queries
+            if query["sql"].startswith('SELECT "nested_example_manager"."id"')
+            and '"level" IN' in query["sql"]
+        ]
+        self.assertEqual(len(unique_together_queries), 1)
+
+    def test_create_unique_related_field_validated_in_batch(self):
+        first_user = User.objects.create(username="first")
+        second_user = User.objects.create(username="second")
+        Manager.objects.create(user=first_user, level="high")
+        company = CompanyUniqueManagerSerializer(
+            data={
+                "name": "Some name",
+                "managers": [
+                    {"user": first_user.pk, "level": "low"},
+                    {"user": second_user.pk, "level": "low"},
+                    {"user": second_user.pk, "level": "high"},
+                ],
+            }
+        )
+        company.is_valid(raise_exception=True)
+        with self.assertRaises(ValidationError) as verror:
+            company.save()
+
+        unique_error = {"user": [ErrorDetail(string="This field must be unique.", code="unique")]}
+        self.assertEqual(verror.exception.detail["managers"], [unique_error, unique_error])
+
+    def test_create_unique_related_source_validated_one_by_one(self):
+        User.objects.create(username="taken")
+        serializer = EmployeeUsernameSerializer()
+        self.assertIn("username", serializer.fields)
+        items = [{"status": "Some status", "user": {"username": "taken"}}]
+
+        with mock.patch.object(
+            serializer, "_validate_unique_each", wraps=serializer._validate_unique_each
+        ) as validate_unique_each:
+            errors = serializer._validate_unique_many(items)
+
+        # The dotted source isn't a field of the serializer model, so the batch query is skipped
+        validate_unique_each.assert_called_once_with(items)
+        self.assertEqual(errors, {})
+
+    def test_create_unique_together_many_items(self):
+        user = User.objects.create(username="user")
+        Manager.objects.create(user=user, level="Level 5")
+        company = CompanyFlatManagerSerializer(
+            data={
+                "name": "Some name",
+                "managers": [{"user": user.pk, "level": "Level %s" % i} for i in range(1200)],
+            }
+        )
+        company.is_valid(raise_exception=True)
+        with self.assertRaises(ValidationError) as verror:
+            company.save()
+
+        # Only the set of values taken by the existing manager is reported
+        self.assertEqual(len(verror.exception.detail["managers"]), 1)
+
+        company = CompanyFlatManagerSerializer(
+            data={
+                "name": "Some name",
+                "managers": [{"user": user.pk, "level": "New %s" % i} for i in range(1200)],
+            }
+        )
+        company.is_valid(raise_exception=True)
+        company.save()
+        self.assertEqual(company.instance.managers.count(), 1200)
+
+    def test_create_planned_writes_success(self):
+        user = UserGroupSerializer(
+            data={"username": "Some name", "groups": [{"name": "Name %s" % i} for i in range(5)]},
+            plan_nested_writes=True,
+        )
+        user.is_valid(raise_exception=True)
+        with CaptureQueriesContext(connection) as queries:
+            user.save()
+
+        inserts = [query for query in queries.captured_queries if query["sql"].startswith("INSERT")]
+        # Users, groups and the links between them are inserted with one statement each
+        self.assertEqual(len(inserts), 3)
+        self.assertEqual(
+            sorted(user.instance.groups.values_list("name", flat=True)),
+            ["Name %s" % i for i in range(5)],
+        )
+        self.assertEqual(len(user.data["groups"]), 5)
+
+    def test_create_generic_relation_saved_by_default(self):
+        saved = []
+
+        def receiver(sender, instance, **kwargs):
+            saved.append(instance.text)
+
+        post_save.connect(receiver, sender=Comment)
+        try:
+            company = CompanySerializer(
+                data={"name": "Company", "comments": [{"text": "Text %s" % i} for i in range(3)]}
+            )
+            company.is_valid(raise_exception=True)
+            company.save()
+        finally:
+            post_save.disconnect(receiver, sender=Comment)
+
+        # Bulk writes are opt-in, so every comment is saved with its signals
+        self.assertEqual(saved, ["Text %s" % i for i in range(3)])
+
+    def test_create_planned_generic_relation(self):
+        company = CompanyCommentsSerializer(
+            data={"name": "Company", "comments": [{"text": "Text %s" % i} for i in range(3)]},
+            plan_nested_writes=True,
+        )
+        company.is_valid(raise_exception=True)
+        with CaptureQueriesContext(connection) as queries:
+            company.save()
+
+        inserts = [query for query in queries.captured_queries if query["sql"].startswith("INSERT")]
+        # The company and all its comments are inserted with one statement each
+        self.assertEqual(len(inserts), 2)
+        self.assertEqual(
+            sorted(company.instance.comments.values_list("text", flat=True)),
+            ["Text %s" % i for i in range(3)],
+        )
+
+    def test_create_planned_writes_fallback(self):
+        # `UserSerializer` has custom `create`, so the members are saved one by one
+        group = GroupSerializer(
+            data={"name": "Some name", "members": [{"username": "user1"}, {"username": "user2"}]},
+            plan_nested_writes=True,
+        )
+        group.is_valid(raise_exception=True)
+        group.save()
+        self.assertEqual(group.instance.members.count(), 2)
+
+        group = GroupSerializer(
+            data={"name": "Some name", "members": [{"username": "user3", "is_active": False}]},
+            plan_nested_writes=True,
+        )
+        group.is_valid(raise_exception=True)
+        with self.assertRaises(ValidationError):
+            group.save()
+
+    @override_settings(DRF_NESTED={"SLOW_SAVE": {"QUERIES": 5}})
+    def test_create_slow_save_logged(self):
+        group = GroupSerializer(
+            data={
+                "name": "Some name",
+                "members": [{"username": "user%s" % i} for i in range(3)],
+                "company": {
+                    "name": "Company",
+                    "comments": [{"text": "Comment %s" % i} for i in range(4)],
+                    "managers": [],
+                },
+            }
+        )
+        group.is_valid(raise_exception=True)
+        with self.assertLogs("drf_nested.slow_save", "WARNING") as logs:
+            group.save()
+
+        record = logs.records[0].nested_save
+        self.assertEqual(record["serializer"], "nested_example.serializers.GroupSerializer")
+        self.assertEqual(record["operation"], "create")
+        self.assertEqual(record["queries"], sum(record["queries_by_model"].values()))
+        self.assertGreaterEqual(record["queries_by_model"]["nested_example.Comment"], 4)
+        self.assertEqual(
+            record["shape"],
+            {
+                "members": {"depth": 1, "items": 3, "max_length": 3},
+                "company": {"depth": 1, "items": 1, "max_length": 1},
+                "company.managers": {"depth": 2, "items": 0, "max_length": 0},
+                "company.comments": {"depth": 2, "items": 4, "max_length": 4},
+            },
+        )
+        self.assertIn("many_to_many_fields", record["stages"])
+        # Time of the nested stages is not counted twice
+        self.assertLessEqual(sum(record["stages"].values()), record["time"])
+        self.assertIsNone(record["error"])
+
+    @override_settings(DRF_NESTED={"SLOW_SAVE": {"QUERIES": 100, "TIME": 10000}})
+    def test_create_fast_save_not_logged(self):
+        group = GroupSerializer(data={"name": "Some name", "members": [{"username": "user"}]})
+        group.is_valid(raise_exception=True)
+        with self.assertNoLogs("drf_nested.slow_save"):
+            group.save()
+
+    def test_create_without_nested_savepoints(self):
+        def count_savepoints(prefix, **kwargs):
+            group = GroupSerializer(
+                data={
+                    "name": "Some name",
+                    "members": [{"username": "%s%s" % (prefix, i)} for i in range(3)],
+                    "company": {"name": "Company", "comments": [{"text": "Comment"}]},
+                },
+                **kwargs,
+            )
+            group.is_valid(raise_exception=True)
+            with CaptureQueriesContext(connection) as queries:
+                group.save()
+            return len([query for query in queries if query["sql"].startswith("SAVEPOINT")])
+
+        # The test case transaction makes the outermost serializer open a savepoint
+        self.assertEqual(count_savepoints("first", nested_savepoints=False), 1)
+        self.assertGreater(count_savepoints("second"), 1)
+
+    def test_create_without_nested_savepoints_error_rolled_back(self):
+        user = UserGroupErrorRaisingSerializer(
+            data={
+                "username": "Some name",
+                "groups": [{"name": "First name"}, {"name": "Some name"}],
+            },
+            nested_savepoints=False,
+        )
+        user.is_valid(raise_exception=True)
+        with self.assertRaises(ValueError):
+            user.save()
+        self.assertFalse(User.objects.filter(username="Some name").exists())
+        self.assertFalse(Group.objects.filter(name="First name").exists())
+
+    def test_create_many_generic_relations_in_batch(self):
+        companies = CompanyCommentsSerializer(
+            data=[
+                {
+                    "name": "Company %s" % index,
+                    "comments": [{"text": "Comment %s" % i} for i in range(3)],
+                }
+                for index in range(5)
+            ],
+            many=True,
+        )
+        companies.is_valid(raise_exception=True)
+        with CaptureQueriesContext(connection) as queries:
+            companies.save()
+
+        comment_queries = [
+            query["sql"] for query in queries if "nested_example_comment" in query["sql"]
+        ]
+        # Comments of all the companies are inserted at once, without fetching the connected ones
+        self.assertEqual(len(comment_queries), 1)
+        self.assertTrue(comment_queries[0].startswith("INSERT"))
+        for company in companies.instance:
+            self.assertEqual(company.comments.count(), 3)
+
+    def test_create_many_planned_level_by_level(self):
+        users = UserGroupSerializer(
+            data=[
+                {"username": "User %s" % i, "groups": [{"name": "Name %s" % j} for j in range(3)]}
+                for i in range(4)
+            ],
+            many=True,
+            plan_nested_writes=True,
+        )
+        self.assertIsInstance(users, NestedListSerializer)
+        users.is_valid(raise_exception=True)
+        with CaptureQueriesContext(connection) as queries:
+            users.save()
+
+        inserts = [query for query in queries.captured_queries if query["sql"].startswith("INSERT")]
+        # All the users, then all their groups, then all the links are inserted with one statement each
+        self.assertEqual(len(inserts), 3)
+        # All the users are refreshed with a single query
+        user_selects = [
+            query
+            for query in queries.captured_queries
+            if query["sql"].startswith('SELECT "nested_example_user"')
+        ]
+        self.assertEqual(len(user_selects), 1)
+        self.assertEqual(
+            [user.username for user in users.instance], ["User %s" % i for i in range(4)]
+        )
+        for user in users.instance:
+            self.assertEqual(user.groups.count(), 3)
+
+    def test_create_many_partially_planned_item_rolled_back(self):
+        group = Group.objects.create(name="Existing")
+        users = UserGroupSerializer(
+            data=[
+                {"username": "User 0", "groups": [{"name": "Name 0"}]},
+                {
+                    "username": "User 1",
+                    "groups": [{"name": "Name 1"}, {"id": group.pk, "name": "Existing"}],
+                },
+                {"username": "User 2", "groups": [{"name": "Name 2"}]},
+            ],
+            many=True,
+            plan_nested_writes=True,
+        )
+        users.is_valid(raise_exception=True)
+        planner = NestedWritePlanner(users.child)
+        with mock.patch.object(planner, "_plan_item", wraps=planner._plan_item) as plan_item_mock:
+            plan, indexes = planner.plan_each(users.validated_data)
+
+        # Every item is planned once
+        root_calls = [call for call in plan_item_mock.call_args_list if call.args[0] is users.child]
+        self.assertEqual(len(root_calls), 3)
+        self.assertEqual(indexes, [0, 2])
+        # Stages of the item, which has an existing group, are dropped
+        self.assertEqual(
+            {stage.model: len(stage.instances) for stage in plan.stages},
+            {User: 2, Group: 2, User.groups.through: 2},
+        )
+        self.assertEqual([user.username for user in plan.roots], ["User 0", "User 2"])
+
+    def test_create_many_errors_by_index(self):
+        groups = GroupSerializer(
+            data=[
+                {"name": "First", "members": [{"username": "user1"}]},
+                {"name": "Second", "members": [{"username": "user2", "is_active": False}]},
+                {"name": "Third", "members": [{"username": "user3"}]},
+            ],
+            many=True,
+        )
+        groups.is_valid(raise_exception=True)
+        with self.assertRaises(ValidationError) as verror:
+            groups.save()
+
+        self.assertEqual(
+            verror.exception.detail,
+            [
+                {},
+                {
+                    "members": [
+                        {"is_active": [ErrorDetail(string="User should be active", code="invalid")]}
+                    ]
+                },
+                {},
+            ],
+        )
+        # The whole list is rolled back
+        self.assertFalse(Group.objects.exists())
+        self.assertFalse(User.objects.filter(username__in=["user1", "user3"]).exists())
@@ -1,16 +1,38 @@
 from copy import copy
+from io import StringIO
 
-from django.test import TestCase
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework.exceptions import ValidationError
 
+from drf_nested.utils import NestedInstrumentation, stats_registry
+from nested_example.models import Company, Employee, EmployeeRole, User
 from nested_example.serializers import (
+    CompanyBulkGroupSerializer,
+    CompanyCommentsSerializer,
+    CompanyNotesSerializer,
     CompanySerializer,
     EmployeeSerializer,
+    GroupSerializer,
+    GroupSyncSerializer,
+    RoleBulkThroughSerializer,
     RoleSerializer,
     UserGroupSerializer,
 )
 
 
+class RecordingInstrumentation(NestedInstrumentation):
+    stages = []
+
+    def stage_started(self, stage):
+        self.stages.append(("start", stage.name, stage.serializer_class.__name__, stage.path))
+
+    def stage_finished(self, stage):
+        self.stages.append(("end", stage.name, stage.path, stage.count))
+
+
 class NestedUpdateMixinTest(TestCase):
     def test_update_direct_nested_success(self):
         employee = EmployeeSerializer(
@@ -225,3 +247,400 @@ class NestedUpdateMixinTest(TestCase):
         data = copy(company.data)
         self.assertEqual(len(data.get("comments")), 1)
         self.assertEqual(data.get("comments")[0]["text"], "Another text")
+
+    def test_update_reverse_nested_fetches_instances_at_once(self):
+        def update_queries(groups_count):
+            user = UserGroupSerializer(
+                data={
+                    "username": "Some name %s" % groups_count,
+                    "groups": [{"name": "Name %s" % i} for i in range(groups_count)],
+                }
+            )
+            user.is_valid(raise_exception=True)
+            user.save()
+            data = copy(user.data)
+            for group in data["groups"]:
+                group["name"] = "Still name"
+
+            updated_user = UserGroupSerializer(instance=user.instance, data=data)
+            with CaptureQueriesContext(connection) as validation_queries:
+                updated_user.is_valid(raise_exception=True)
+            with CaptureQueriesContext(connection) as queries:
+                updated_user.save()
+            return len(validation_queries), len(queries)
+
+        validation_queries, save_queries = update_queries(1)
+        many_validation_queries, many_save_queries = update_queries(3)
+        # Instances are fetched once, when the validation starts, and reused by the write
+        self.assertEqual(many_validation_queries, validation_queries)
+        # Every additional item costs only its own UPDATE statement
+        self.assertEqual(many_save_queries - save_queries, 2)
+
+    def test_update_reverse_nested_bulk_success(self):
+        company = CompanyBulkGroupSerializer(
+            data={"name": "Company name", "groups": [{"name": "Group %s" % i} for i in range(2)]}
+        )
+        company.is_valid(raise_exception=True)
+        company.save()
+        data = copy(company.data)
+        for group in data["groups"]:
+            group["name"] = "New %s" % group["name"][-1]
+
+        updated_company = CompanyBulkGroupSerializer(instance=company.instance, data=data)
+        updated_company.is_valid(raise_exception=True)
+        with CaptureQueriesContext(connection) as queries:
+            updated_company.save()
+
+        group_updates = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith('UPDATE "nested_example_group"')
+        ]
+        self.assertEqual(len(group_updates), 1)
+        self.assertIn('"name" = CASE', group_updates[0])
+        self.assertEqual(
+            sorted(group.name for group in company.instance.groups.all()),
+            ["New 0", "New 1"],
+        )
+
+    def test_update_reverse_nested_trim_deletes_at_once(self):
+        company = CompanyBulkGroupSerializer(
+            data={"name": "Company name", "groups": [{"name": "Group %s" % i} for i in range(3)]}
+        )
+        company.is_valid(raise_exception=True)
+        company.save()
+        data = copy(company.data)
+        data["groups"] = data["groups"][:1]
+
+        updated_company = CompanyBulkGroupSerializer(instance=company.instance, data=data)
+        updated_company.is_valid(raise_exception=True)
+        with CaptureQueriesContext(connection) as queries:
+            updated_company.save()
+
+        group_deletes = [
+            query
+            for query in queries.captured_queries
+            if query["sql"].startswith('DELETE FROM "nested_example_group"')
+        ]
+        self.assertEqual(len(group_deletes), 1)
+        self.assertEqual(company.instance.groups.count(), 1)
+
+    def test_update_many_to_many_nested_trim_removes_at_once(self):
+        group = GroupSerializer(
+            data={"name": "Some name", "members": [{"username": "user%s" % i} for i in range(3)]}
+        )
+        group.is_valid(raise_exception=True)
+        group.save()
+        data = copy(group.data)
+        data["members"] = data["members"][:1]
+
+        updated_group = GroupSerializer(instance=group.instance, data=data)
+        updated_group.is_valid(raise_exception=True)
+        with CaptureQueriesContext(connection) as queries:
+            updated_group.save()
+
+        member_deletes = [
+            query
+            for query in queries.captured_queries
+            if query["sql"].startswith('DELETE FROM "nested_example_group_members"')
+        ]
+        self.assertEqual(len(member_deletes), 1)
+        self.assertEqual(group.instance.members.count(), 1)
+
+    def test_update_many_to_many_nested_unique_values_moved(self):
+        group = GroupSerializer(
+            data={"name": "Some name", "members": [{"username": "first"}, {"username": "second"}]}
+        )
+        group.is_valid(raise_exception=True)
+        group.save()
+        data = copy(group.data)
+        # The first member takes a new name, releasing its current one for the second member
+        data["members"][0]["username"] = "third"
+        data["members"][1]["username"] = "first"
+
+        updated_group = GroupSerializer(instance=group.instance, data=data)
+        updated_group.is_valid(raise_exception=True)
+        updated_group.save()
+        self.assertEqual(
+            sorted(group.instance.members.values_list("username", flat=True)), ["first", "third"]
+        )
+
+    def test_update_dry_run_report(self):
+        user = UserGroupSerializer(
+            data={"username": "Some name", "groups": [{"name": "Name %s" % i} for i in range(3)]}
+        )
+        user.is_valid(raise_exception=True)
+        user.save()
+        data = copy(user.data)
+        data["username"] = "New name"
+        for group in data["groups"]:
+            group["name"] = "New name"
+
+        updated_user = UserGroupSerializer(instance=user.instance, data=data)
+        updated_user.is_valid(raise_exception=True)
+        report = updated_user.save(dry_run=True)
+
+        self.assertIs(updated_user.instance, user.instance)
+        # The instance drops the values that were rolled back
+        self.assertEqual(user.instance.username, "Some name")
+        self.assertEqual(report.get_count(path="groups", operation="update"), 3)
+        self.assertEqual(report.fields["groups"]["update"]["count"], 3)
+        self.assertEqual(report.get_count(path="", operation="update"), 1)
+        self.assertEqual(report.count, len(report.queries))
+        # Nothing is written
+        self.assertEqual(
+            sorted(user.instance.groups.values_list("name", flat=True)),
+            ["Name %s" % i for i in range(3)],
+        )
+
+    @override_settings(
+        DRF_NESTED={
+            "INSTRUMENTATION": [
+                "nested_example.tests.test_nested_update_mixin.RecordingInstrumentation"
+            ]
+        }
+    )
+    def test_update_instrumentation_stages(self):
+        group = GroupSerializer(
+            data={"name": "Some name", "members": [{"username": "user%s" % i} for i in range(3)]}
+        )
+        group.is_valid(raise_exception=True)
+        group.save()
+        data = copy(group.data)
+        data["members"] = data["members"][:1]
+
+        RecordingInstrumentation.stages = []
+        updated_group = GroupSerializer(instance=group.instance, data=data)
+        updated_group.is_valid(raise_exception=True)
+        updated_group.save()
+
+        stages = RecordingInstrumentation.stages
+        self.assertEqual(stages[0], ("start", "extract_nested", "GroupSerializer", ""))
+        self.assertIn(("start", "save_instance", "GroupSerializer", ""), stages)
+        self.assertIn(("start", "many_to_many_fields", "GroupSerializer", "members"), stages)
+        self.assertIn(("end", "many_to_many_fields", "members", 1), stages)
+        self.assertIn(("end", "delete_difference", "members", 2), stages)
+        self.assertIn(("end", "unique_validation", "members", 1), stages)
+        self.assertEqual(len([stage for stage in stages if stage[0] == "start"]), len(stages) / 2)
+
+    @override_settings(DRF_NESTED={"STATS": True})
+    def test_update_stats(self):
+        stats_registry.reset()
+        group = GroupSerializer(
+            data={"name": "Some name", "members": [{"username": "user%s" % i} for i in range(3)]}
+        )
+        group.is_valid(raise_exception=True)
+        group.save()
+        data = copy(group.data)
+        data["members"] = data["members"][:1]
+        updated_group = GroupSerializer(instance=group.instance, data=data)
+        updated_group.is_valid(raise_exception=True)
+        updated_group.save()
+
+        group_stats = stats_registry.get(GroupSerializer)
+        self.assertEqual((group_stats.calls, group_stats.items, group_stats.created), (2, 2, 1))
+        members_stats = stats_registry.get(GroupSerializer, "members")
+        self.assertEqual(members_stats.calls, 2)
+        self.assertEqual(members_stats.items, 4)
+        # Three users and three links are created, two links are removed
+        self.assertEqual(members_stats.created, 6)
+        self.assertEqual(members_stats.deleted, 2)
+        self.assertGreater(members_stats.queries, 0)
+
+        output = StringIO()
+        call_command("nested_stats", format="prometheus", reset=True, stdout=output)
+        self.assertIn(
+            'drf_nested_rows_deleted_total{serializer="nested_example.serializers.GroupSerializer",'
+            'path="members"} 2',
+            output.getvalue(),
+        )
+        self.assertIsNone(stats_registry.get(GroupSerializer))
+
+    @override_settings(DRF_NESTED={"STATS": True})
+    def test_bulk_write_stats(self):
+        stats_registry.reset()
+        company = CompanyCommentsSerializer(
+            data={"name": "Company", "comments": [{"text": "Text %s" % i} for i in range(3)]}
+        )
+        company.is_valid(raise_exception=True)
+        company.save()
+        data = copy(company.data)
+        data["comments"] = [dict(comment, text="Changed") for comment in data["comments"][:2]]
+        updated_company = CompanyCommentsSerializer(instance=company.instance, data=data)
+        updated_company.is_valid(raise_exception=True)
+        updated_company.save()
+
+        # The deferred bulk writes are counted for the field that collected them
+        company_stats = stats_registry.get(CompanyCommentsSerializer)
+        self.assertEqual((company_stats.created, company_stats.updated), (1, 1))
+        comments_stats = stats_registry.get(CompanyCommentsSerializer, "comments")
+        self.assertEqual(
+            (comments_stats.created, comments_stats.updated, comments_stats.deleted), (3, 2, 1)
+        )
+        self.assertGreater(comments_stats.queries, 0)
+
+    def test_update_through_items_in_bulk(self):
+        employees = [
+            Employee.objects.create(status="active", user=User.objects.create(username="e%s" % i))
+            for i in range(4)
+        ]
+        role = RoleBulkThroughSerializer(
+            data={
+                "permission": "high",
+                "name": "admin",
+                "employees": [
+                    {"employee_id": employee.pk, "name": "Name %s" % index}
+                    for index, employee in enumerate(employees[:3])
+                ],
+            }
+        )
+        role.is_valid(raise_exception=True)
+        role.save()
+        self.assertEqual(role.instance.employee_roles.count(), 3)
+
+        # The first row is kept, the second is changed, the third is removed and the fourth is added
+        data = copy(role.data)
+        data["employees"] = [
+            {"employee_id": employees[0].pk, "name": "Name 0"},
+            {"employee_id": employees[1].pk, "name": "Changed"},
+            {"employee_id": employees[3].pk, "name": "Name 3"},
+        ]
+        kept_row = EmployeeRole.objects.get(role=role.instance, employee=employees[0])
+        updated_role = RoleBulkThroughSerializer(instance=role.instance, data=data)
+        updated_role.is_valid(raise_exception=True)
+        with CaptureQueriesContext(connection) as queries:
+            updated_role.save()
+
+        through_queries = [
+            query["sql"].split(None, 1)[0]
+            for query in queries
+            if "nested_example_employeerole" in query["sql"].split("WHERE")[0]
+        ]
+        # One query to load the existing rows and one query for every write
+        self.assertEqual(sorted(through_queries), ["DELETE", "INSERT", "SELECT", "UPDATE"])
+        self.assertEqual(
+            dict(
+                role.instance.employee_roles.values_list("employee_id", "name").order_by("employee")
+            ),
+            {employees[0].pk: "Name 0", employees[1].pk: "Changed", employees[3].pk: "Name 3"},
+        )
+        self.assertTrue(EmployeeRole.objects.filter(pk=kept_row.pk).exists())
+
+    def test_update_many_to_many_links_synced(self):
+        group = GroupSyncSerializer(
+            data={"name": "Some name", "members": [{"username": "user%s" % i} for i in range(3)]}
+        )
+        group.is_valid(raise_exception=True)
+        group.save()
+        self.assertEqual(group.instance.members.count(), 3)
+
+        def get_link_writes(data):
+            updated_group = GroupSyncSerializer(instance=group.instance, data=data)
+            updated_group.is_valid(raise_exception=True)
+            with CaptureQueriesContext(connection) as queries:
+                updated_group.save()
+            return sorted(
+                query["sql"].split(None, 1)[0]
+                for query in queries
+                if "nested_example_group_members" in query["sql"].split("WHERE")[0]
+                and not query["sql"].startswith("SELECT")
+            )
+
+        # Repeated representation doesn't write any link
+        self.assertEqual(get_link_writes(copy(group.data)), [])
+
+        data = copy(group.data)
+        data["members"] = data["members"][1:] + [{"username": "new user"}]
+        self.assertEqual(get_link_writes(data), ["DELETE", "INSERT"])
+        self.assertEqual(
+            sorted(group.instance.members.values_list("username", flat=True)),
+            ["new user", "user1", "user2"],
+        )
+
+    def test_update_generic_relation_in_bulk(self):
+        company = CompanyCommentsSerializer(
+            data={"name": "Company", "comments": [{"text": "Comment %s" % i} for i in range(4)]}
+        )
+        company.is_valid(raise_exception=True)
+        company.save()
+
+        # The first comment is kept, the next two are changed and the last one is removed
+        data = copy(company.data)
+        data["comments"] = [dict(comment) for comment in data["comments"][:3]]
+        data["comments"][1]["text"] = "Changed 1"
+        data["comments"][2]["text"] = "Changed 2"
+        updated_company = CompanyCommentsSerializer(instance=company.instance, data=data)
+        updated_company.is_valid(raise_exception=True)
+        with CaptureQueriesContext(connection) as queries:
+            updated_company.save()
+
+        comment_queries = [
+            query["sql"].split(None, 1)[0]
+            for query in queries
+            if "nested_example_comment" in query["sql"].split("WHERE")[0]
+        ]
+        # The connected comments are fetched once, changed ones are written with a single update
+        self.assertEqual(sorted(comment_queries), ["DELETE", "SELECT", "UPDATE"])
+        self.assertEqual(
+            list(company.instance.comments.order_by("pk").values_list("text", flat=True)),
+            ["Comment 0", "Changed 1", "Changed 2"],
+        )
+
+    def test_update_many_generic_relations_preloaded(self):
+        for serializer_class, field_name in (
+            (CompanyCommentsSerializer, "comments"),
+            (CompanyNotesSerializer, "notes"),
+        ):
+            with self.subTest(serializer_class=serializer_class):
+                self._test_update_many_generic_relations_preloaded(serializer_class, field_name)
+
+    def _test_update_many_generic_relations_preloaded(self, serializer_class, field_name):
+        companies = [Company.objects.create(name="Company %s" % index) for index in range(3)]
+        for company in companies:
+            company.comments.create(text="Comment")
+
+        data = [
+            {
+                "id": company.pk,
+                "name": company.name,
+                field_name: [{"id": company.comments.get().pk, "text": "Changed %s" % index}],
+            }
+            for index, company in enumerate(companies)
+        ]
+        serializer = serializer_class(
+            instance=Company.objects.filter(pk__in=[company.pk for company in companies]),
+            data=data,
+            many=True,
+        )
+        serializer.is_valid(raise_exception=True)
+        with CaptureQueriesContext(connection) as queries:
+            serializer.save()
+
+        comment_queries = [
+            query["sql"].split(None, 1)[0]
+            for query in queries
+            if "nested_example_comment" in query["sql"].split("WHERE")[0]
+        ]
+        # Comments of all the companies are fetched once and written with a single update
+        self.assertEqual(sorted(comment_queries), ["SELECT", "UPDATE"])
+        self.assertEqual([company.pk for company in serializer.instance], [c.pk for c in companies])
+        for index, company in enumerate(companies):
+            self.assertEqual(
+                list(company.comments.values_list("text", flat=True)), ["Changed %s" % index]
+            )
+
+    def test_update_many_unknown_pk_reported_by_index(self):
+        company = Company.objects.create(name="Company")
+        serializer = CompanyCommentsSerializer(
+            instance=Company.objects.all(),
+            data=[{"id": company.pk, "name": "New name"}, {"id": company.pk + 1, "name": "Other"}],
+            many=True,
+        )
+        serializer.is_valid(raise_exception=True)
+        with self.assertRaises(ValidationError) as verror:
+            serializer.save()
+
+        self.assertEqual(verror.exception.detail[0], {})
+        self.assertIn("id", verror.exception.detail[1])
+        company.refresh_from_db()
+        self.assertEqual(company.name, "Company")
@@ -0,0 +1,44 @@
+from django.test import TestCase
+
+from drf_nested.testing import assert_nested_query_budget
+from nested_example.serializers import CompanyBulkGroupSerializer, UserGroupSerializer
+
+
+def user_groups_payload(size):
+    return {"username": "User %s" % size, "groups": [{"name": "Name %s" % i} for i in range(size)]}
+
+
+def company_groups_payload(size):
+    return {"name": "Company %s" % size, "groups": [{"name": "Name %s" % i} for i in range(size)]}
+
+
+class NestedQueryBudgetTest(TestCase):
+    def test_planned_create_constant(self):
+        counts = assert_nested_query_budget(
+            UserGroupSerializer,
+            user_groups_payload,
+            operations=("create",),
+            serializer_kwargs={"plan_nested_writes": True},
+        )
+        self.assertEqual(counts["create"][1], counts["create"][100])
+
+    def test_bulk_update_batched(self):
+        def update_payload(size, serializer):
+            data = serializer.data
+            for group in data["groups"]:
+                group["name"] = group["name"].replace("Name", "New")
+            return data
+
+        # Groups are updated in chunks of two items
+        assert_nested_query_budget(
+            CompanyBulkGroupSerializer,
+            company_groups_payload,
+            max_queries_per_item=0.5,
+            update_payload_factory=update_payload,
+        )
+
+    def test_linear_create_fails(self):
+        with self.assertRaises(AssertionError):
+            assert_nested_query_budget(
+                UserGroupSerializer, user_groups_payload, sizes=(1, 5), operations=("create",)
+            )